@@ -0,0 +1,3267 @@
+import argparse
+import gzip
+import hashlib
+import http.client
+import json
+import math
+import mimetypes
+import mmap
+import os
+import random
+import re
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, urlencode, urlsplit
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from stub_servers import (
+    self_signed_certificate,
+    start_api_stub,
+    start_cashcow_stub,
+    start_inforu_stub,
+    stub_url,
+)
+from update_postman_collection import build_collection
+
+
+VARIABLE_PATTERN = re.compile(r"{{\s*([\w.-]+)\s*}}")
+PATH_SAFE_CHARACTERS = "/%:@!$&'()*+,;=-._~"
+FOLDER_ROLES = {
+    "Merchant": "merchant",
+    "Plugin Integrations": "merchant",
+}
+DEFAULT_ROLES = ("admin", "agent", "merchant")
+PERCENTILES = (50, 90, 95, 99)
+SALES_RANGES = ("last_week", "last_month", "last_quarter", "last_year")
+DASHBOARD_ENDPOINTS = [
+    {
+        "item": "Orders/Dashboard stats",
+        "roles": ["admin", "agent", "merchant"],
+        "queries": [{}],
+    },
+    {
+        "item": "Orders/Sales performance",
+        "roles": ["admin", "agent", "merchant"],
+        "queries": [{"range": value} for value in SALES_RANGES],
+    },
+    {
+        "item": "Admin/Dashboard/Orders summary",
+        "roles": ["admin"],
+        "queries": [{}],
+    },
+    {
+        "item": "Merchant/Merchant dashboard",
+        "roles": ["merchant"],
+        "queries": [{}],
+    },
+]
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+IMAGE_SOURCE_DIRECTORY = Path(__file__).resolve().parent.parent / "storage" / "images"
+BASELINE_DIRECTORY = Path(__file__).resolve().parent / "baselines"
+CI_BRANCH_VARIABLES = ("GITHUB_HEAD_REF", "GITHUB_REF_NAME", "CI_COMMIT_REF_NAME", "BRANCH_NAME", "GIT_BRANCH")
+SIZE_BUCKETS = [
+    (64 * 1024, "<64KB"),
+    (256 * 1024, "64KB-256KB"),
+    (1024 * 1024, "256KB-1MB"),
+    (5 * 1024 * 1024, "1MB-5MB"),
+    (None, ">5MB"),
+]
+CUSTOMER_IMPORT_ROWS = (10_000, 100_000, 1_000_000, 5_000_000)
+CUSTOMER_CSV_HEADER = "name,phone,email,notes,street,city,zip,country\n"
+CUSTOMER_CITIES = ("תל אביב", "רמת גן", "פתח תקווה", "חיפה", "ירושלים", "באר שבע")
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MEMORY_ERROR_MARKERS = (b"Allowed memory size", b"Out of memory", b"memory exhausted")
+BROADCAST_LIST_SIZES = (100, 1_000, 5_000, 20_000)
+BROADCAST_EVENT_KEY = "broadcast.manual"
+RESULTS_FORMAT = "kfitz-runner-results/1"
+HISTOGRAM_GROWTH = 1.02
+LOAD_EXCLUDED_FOLDERS = ("Authentication",)
+SERVER_TIMING_DB_NAMES = {"db", "database", "sql", "query", "queries", "mysql"}
+SERVER_TIMING_TOTAL_NAMES = {"total", "app", "php", "laravel", "response"}
+QUERY_COUNT_HEADERS = ("x-query-count", "x-db-query-count", "x-queries", "x-database-queries")
+DB_TIME_HEADERS = ("x-db-time", "x-query-time", "x-database-time")
+SERVER_RESULT_TOTALS = (
+    "responses",
+    "client_ms",
+    "db_ms",
+    "db_responses",
+    "app_ms",
+    "app_responses",
+    "app_client_ms",
+    "queries",
+    "query_responses",
+)
+GATED_PERCENTILES = (95, 99)
+DEFAULT_STEADY_STATE_CAP = 120.0
+SHIPMENT_COUNTS = (50, 200, 1_000)
+CASHCOW_CATALOG_SIZES = (1_000, 10_000, 100_000, 500_000)
+STOREFRONT_INVENTORY_ITEMS = (
+    "Public Catalog/Get product",
+    "Public Catalog/List products",
+    "Plugin Integrations/Plugin Products - Inventory Snapshot",
+)
+CONNECTION_STRATEGIES = ("keep-alive", "fresh", "http2")
+LOCK_ERROR_MARKERS = (b"Deadlock found", b"Lock wait timeout exceeded", b"SQLSTATE[40001]", b"General error: 1205")
+THINK_DISTRIBUTIONS = {
+    "const": (1, lambda rng, ms: ms),
+    "uniform": (2, lambda rng, low, high: rng.uniform(low, high)),
+    "exp": (1, lambda rng, mean: rng.expovariate(1 / mean) if mean else 0.0),
+    "normal": (2, lambda rng, mean, deviation: rng.gauss(mean, deviation)),
+    "lognormal": (2, lambda rng, median, sigma: median * math.exp(rng.gauss(0, sigma))),
+}
+PLUGIN_MIX = {
+    "inventory": ("Plugin Integrations/Plugin Products - Inventory Snapshot", 70),
+    "product-inventory": ("Plugin Integrations/Plugin Products - Single Inventory", 10),
+    "products": ("Plugin Integrations/Plugin Products - List", 8),
+    "product": ("Plugin Integrations/Plugin Products - Show", 5),
+    "categories": ("Plugin Integrations/Plugin Categories - List", 4),
+    "category": ("Plugin Integrations/Plugin Categories - Show", 2),
+    "order": ("Plugin Integrations/Plugin Order - Create", 1),
+}
+
+
+def load_collection(path=None):
+    if path:
+        with Path(path).open(encoding="utf-8") as f:
+            return json.load(f)
+    return build_collection()
+
+
+def collection_variables(collection, overrides=None):
+    variables = {entry["key"]: entry.get("value", "") for entry in collection.get("variable", [])}
+    if overrides:
+        variables.update(overrides)
+    return variables
+
+
+def parse_assignments(values):
+    assignments = {}
+    for value in values or []:
+        key, separator, assigned = value.partition("=")
+        if not separator:
+            raise SystemExit(f"Expected key=value, got {value!r}")
+        assignments[key.strip()] = assigned
+    return assignments
+
+
+def resolve(value, variables):
+    return VARIABLE_PATTERN.sub(lambda match: str(variables.get(match.group(1), match.group(0))), value)
+
+
+def iter_items(node, folder=()):
+    for entry in node.get("item", []):
+        if "item" in entry:
+            yield from iter_items(entry, folder + (entry["name"],))
+        else:
+            yield folder, entry
+
+
+def flatten_items(collection):
+    items = []
+    for folder, entry in iter_items(collection):
+        items.append(
+            {
+                "key": "/".join(folder + (entry["name"],)),
+                "folder": "/".join(folder),
+                "name": entry["name"],
+                "method": entry["request"]["method"],
+                "request": entry["request"],
+            }
+        )
+    return items
+
+
+def items_by_key(collection):
+    return {item["key"]: item for item in flatten_items(collection)}
+
+
+def select_items(collection, folders=None, methods=None):
+    selected = []
+    for item in flatten_items(collection):
+        if folders and not any(item["key"].startswith(folder) for folder in folders):
+            continue
+        if methods and item["method"] not in methods:
+            continue
+        selected.append(item)
+    return selected
+
+
+def item_role(item, default):
+    top_folder = item["folder"].split("/")[0]
+    return FOLDER_ROLES.get(top_folder, default)
+
+
+def prepare_request(item, variables, query=None):
+    request = item["request"]
+    url = request["url"]
+    path = "/" + "/".join(quote(resolve(segment, variables), safe=PATH_SAFE_CHARACTERS) for segment in url["path"])
+    params = {
+        entry["key"]: resolve(entry.get("value") or "", variables)
+        for entry in url.get("query", [])
+        if not entry.get("disabled")
+    }
+    if query:
+        params.update(query)
+    if params:
+        path = f"{path}?{urlencode(params)}"
+
+    headers = {entry["key"]: resolve(entry["value"], variables) for entry in request.get("header", [])}
+    body = None
+    if request.get("body", {}).get("mode") == "raw":
+        body = resolve(request["body"]["raw"], variables).encode("utf-8")
+
+    return {
+        "key": item["key"],
+        "method": request["method"],
+        "path": path,
+        "headers": headers,
+        "body": body,
+    }
+
+
+class HttpClient:
+    def __init__(self, base_url, timeout=30.0, fresh=False, context=None):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.fresh = fresh
+        self.context = context or (ssl.create_default_context() if self.scheme == "https" else None)
+        self._local = threading.local()
+
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self.scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    self.host,
+                    self.port,
+                    timeout=self.timeout,
+                    context=self.context,
+                )
+            else:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def reset(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def open(self, connection):
+        started = time.perf_counter()
+        sock = socket.create_connection((connection.host, connection.port), self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connected = time.perf_counter()
+        if self.scheme == "https":
+            sock = self.context.wrap_socket(sock, server_hostname=connection.host)
+        connection.sock = sock
+        return {
+            "tcp_ms": (connected - started) * 1000,
+            "tls_ms": (time.perf_counter() - connected) * 1000 if self.scheme == "https" else None,
+        }
+
+    def connect(self):
+        self.reset()
+        try:
+            self.open(self.connection())
+        except OSError:
+            self.reset()
+
+    def send(self, prepared, token=None, buffer=None):
+        headers = {"Accept": "application/json"}
+        headers.update(prepared["headers"])
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if self.fresh:
+            headers["Connection"] = "close"
+
+        started = time.perf_counter()
+        handshake = None
+        try:
+            connection = self.connection()
+            if connection.sock is None:
+                handshake = self.open(connection)
+            connection.request(
+                prepared["method"],
+                self.prefix + prepared["path"],
+                body=prepared["body"],
+                headers=headers,
+            )
+            response = connection.getresponse()
+            first_byte = time.perf_counter()
+            if buffer is None:
+                payload = response.read()
+                size = len(payload)
+            else:
+                payload = b""
+                size = 0
+                view = memoryview(buffer)
+                while True:
+                    read = response.readinto(view)
+                    if not read:
+                        break
+                    size += read
+                view.release()
+        except (OSError, http.client.HTTPException) as exc:
+            self.reset()
+            return {
+                "status": 0,
+                "elapsed_ms": (time.perf_counter() - started) * 1000,
+                "ttfb_ms": None,
+                "headers": {},
+                "body": b"",
+                "bytes": 0,
+                "handshake": handshake,
+                "error": f"{type(exc).__name__}: {exc}",
+            }
+
+        if response.will_close or self.fresh:
+            self.reset()
+        return {
+            "status": response.status,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "ttfb_ms": (first_byte - started) * 1000,
+            "headers": {name.lower(): value for name, value in response.getheaders()},
+            "body": payload,
+            "bytes": size,
+            "handshake": handshake,
+            "error": None,
+        }
+
+
+def login(client, variables, role):
+    email = variables.get(f"{role}_email")
+    password = variables.get(f"{role}_password")
+    if not email or not password:
+        return None
+    return login_with_credentials(client, email, password)
+
+
+def login_with_credentials(client, email, password):
+    prepared = {
+        "key": "login",
+        "method": "POST",
+        "path": "/api/login",
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps({"email": email, "password": password}).encode("utf-8"),
+    }
+    response = client.send(prepared)
+    if response["status"] != 200:
+        return None
+    try:
+        payload = json.loads(response["body"])
+    except ValueError:
+        return None
+    return (payload.get("data") or {}).get("token")
+
+
+def collection_merchants(variables):
+    merchants = []
+    for suffix in ("", "2"):
+        email = variables.get(f"merchant_email{suffix}")
+        password = variables.get(f"merchant_password{suffix}")
+        if email and password:
+            merchants.append((email, password))
+    return merchants
+
+
+def response_data(response):
+    try:
+        return json.loads(response["body"]).get("data")
+    except (ValueError, AttributeError):
+        return None
+
+
+def send_item(client, item, variables, token=None, payload=None, query=None):
+    prepared = prepare_request(item, variables, query)
+    if payload is not None:
+        prepared["body"] = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        prepared["headers"] = {"Content-Type": "application/json"}
+    return client.send(prepared, token)
+
+
+def role_tokens(client, variables, roles, explicit=None):
+    tokens = {}
+    for role in roles:
+        token = (explicit or {}).get(role) or variables.get(f"{role}_token") or login(client, variables, role)
+        if token:
+            tokens[role] = token
+        else:
+            print(f"warning: no token for role '{role}', skipping its requests", file=sys.stderr)
+    return tokens
+
+
+def percentile(samples, pct, presorted=False):
+    if not samples:
+        return None
+    ordered = samples if presorted else sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(samples):
+    if not samples:
+        return {"count": 0}
+    summary = {
+        "count": len(samples),
+        "mean": statistics.fmean(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(samples, pct)
+    return summary
+
+
+def is_success(response):
+    return 200 <= response["status"] < 400
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def print_table(headers, rows):
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for index, cell in enumerate(row):
+            widths[index] = max(widths[index], len(str(cell)))
+    line = "  ".join(header.ljust(widths[index]) for index, header in enumerate(headers))
+    print(line)
+    print("  ".join("-" * width for width in widths))
+    for row in rows:
+        print("  ".join(str(cell).ljust(widths[index]) for index, cell in enumerate(row)))
+
+
+def write_results(path, results):
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def run_reset_command(command):
+    if command:
+        subprocess.run(command, shell=True, check=True)
+
+
+def dashboard_cases(collection, roles):
+    available = items_by_key(collection)
+    cases = []
+    for endpoint in DASHBOARD_ENDPOINTS:
+        item = available.get(endpoint["item"])
+        if item is None:
+            print(f"warning: '{endpoint['item']}' is not in the collection", file=sys.stderr)
+            continue
+        for role in endpoint["roles"]:
+            if role not in roles:
+                continue
+            for query in endpoint["queries"]:
+                cases.append({"item": item, "role": role, "query": query})
+    return cases
+
+
+def case_label(case):
+    query = urlencode(case["query"])
+    return f"{case['item']['key']} [{case['role']}]" + (f" ?{query}" if query else "")
+
+
+def run_dashboard(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    tokens = role_tokens(client, variables, args.roles, parse_assignments(args.token))
+    cases = dashboard_cases(collection, tokens)
+
+    measurements = {case_label(case): {"case": case, "cold": [], "warm": [], "errors": 0} for case in cases}
+    if args.rounds > 1 and not args.reset_command:
+        print(
+            "warning: without --reset-command only the first round's requests are cold; "
+            "later rounds skip their first request and add warm samples only",
+            file=sys.stderr,
+        )
+    for round_index in range(args.rounds):
+        for label, measurement in measurements.items():
+            case = measurement["case"]
+            prepared = prepare_request(case["item"], variables, case["query"])
+            run_reset_command(args.reset_command)
+            client.connect()
+            for attempt in range(args.warm + 1):
+                response = client.send(prepared, tokens[case["role"]])
+                if not is_success(response):
+                    measurement["errors"] += 1
+                    continue
+                if attempt == 0 and round_index and not args.reset_command:
+                    continue
+                bucket = "cold" if attempt == 0 else "warm"
+                measurement[bucket].append(response["elapsed_ms"])
+
+    rows = []
+    endpoints = {}
+    report = {"mode": "dashboard", "rounds": args.rounds, "warm": args.warm, "cases": {}, "endpoints": {}}
+    for label, measurement in measurements.items():
+        cold = summarize(measurement["cold"])
+        warm = summarize(measurement["warm"])
+        ratio = cold["mean"] / warm["mean"] if cold["count"] and warm["count"] and warm["mean"] else None
+        endpoint = endpoints.setdefault(measurement["case"]["item"]["key"], {"cold": [], "warm": [], "errors": 0})
+        endpoint["cold"].extend(measurement["cold"])
+        endpoint["warm"].extend(measurement["warm"])
+        endpoint["errors"] += measurement["errors"]
+        report["cases"][label] = {"cold": cold, "warm": warm, "ratio": ratio, "errors": measurement["errors"]}
+        rows.append(
+            [
+                label,
+                format_ms(cold.get("mean")),
+                format_ms(warm.get("p50")),
+                format_ms(warm.get("mean")),
+                "-" if ratio is None else f"{ratio:.2f}",
+                format_ms(warm.get("stdev")),
+                measurement["errors"],
+            ]
+        )
+    print_table(["case", "cold ms", "warm p50", "warm mean", "cold/warm", "warm stdev", "errors"], rows)
+    print()
+
+    rows = []
+    regressions = []
+    for key, endpoint in endpoints.items():
+        cold = summarize(endpoint["cold"])
+        warm = summarize(endpoint["warm"])
+        ratio = cold["mean"] / warm["mean"] if cold["count"] and warm["count"] and warm["mean"] else None
+        variance = statistics.variance(endpoint["warm"]) if len(endpoint["warm"]) > 1 else 0.0
+        report["endpoints"][key] = {
+            "cold": cold,
+            "warm": warm,
+            "ratio": ratio,
+            "warm_variance": variance,
+            "errors": endpoint["errors"],
+        }
+        if args.expect_ratio and (ratio is None or ratio < args.expect_ratio):
+            regressions.append(key)
+        rows.append(
+            [
+                key,
+                format_ms(cold.get("mean")),
+                format_ms(warm.get("mean")),
+                "-" if ratio is None else f"{ratio:.2f}",
+                f"{variance:.1f}",
+                endpoint["errors"],
+            ]
+        )
+    print_table(["endpoint", "cold ms", "warm ms", "cold/warm", "warm var", "errors"], rows)
+
+    if args.output:
+        write_results(args.output, report)
+    if regressions:
+        print(f"\ncold/warm ratio below {args.expect_ratio} for: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def size_bucket(size):
+    for limit, label in SIZE_BUCKETS:
+        if limit is None or size < limit:
+            return label
+    return SIZE_BUCKETS[-1][1]
+
+
+def run_concurrently(function, tasks, concurrency):
+    if concurrency <= 1:
+        return [function(task) for task in tasks]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(function, tasks))
+
+
+def build_image_corpus(source):
+    corpus = []
+    for path in sorted(Path(source).iterdir()):
+        if path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+            continue
+        size = path.stat().st_size
+        if size == 0:
+            continue
+        corpus.append({"file": str(path), "size": size, "bucket": size_bucket(size)})
+    return corpus
+
+
+def multipart_file_body(field, path, chunk_size):
+    boundary = uuid.uuid4().hex
+    filename = Path(path).name
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    size = Path(path).stat().st_size
+
+    def chunks():
+        yield head
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for offset in range(0, size, chunk_size):
+                    chunk = view[offset:offset + chunk_size]
+                    yield chunk
+                    chunk.release()
+        yield tail
+
+    return {
+        "content_type": f"multipart/form-data; boundary={boundary}",
+        "length": len(head) + size + len(tail),
+        "chunks": chunks(),
+    }
+
+
+def transfer_summary(records, wall_seconds):
+    elapsed = [record["elapsed_ms"] for record in records if record["ok"]]
+    ttfb = [record["ttfb_ms"] for record in records if record["ok"] and record["ttfb_ms"] is not None]
+    transferred = sum(record["bytes"] for record in records if record["ok"])
+    stream_seconds = sum(elapsed) / 1000
+    return {
+        "requests": len(records),
+        "errors": sum(1 for record in records if not record["ok"]),
+        "bytes": transferred,
+        "wall_s": wall_seconds,
+        "mb_per_s": transferred / (1024 * 1024) / wall_seconds if wall_seconds else None,
+        "stream_mb_per_s": transferred / (1024 * 1024) / stream_seconds if stream_seconds else None,
+        "latency": summarize(elapsed),
+        "ttfb": summarize(ttfb),
+    }
+
+
+def run_images(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    available = items_by_key(collection)
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    tokens = role_tokens(client, variables, ["admin"], parse_assignments(args.token))
+
+    if args.corpus:
+        with Path(args.corpus).open(encoding="utf-8") as f:
+            corpus = json.load(f)
+    else:
+        corpus = build_image_corpus(args.source)
+    if args.write_corpus:
+        write_results(args.write_corpus, corpus)
+    if not corpus:
+        print(f"no images found in {args.source}", file=sys.stderr)
+        return 1
+
+    upload_item = available["Admin/Products/Upload product image"]
+    download_item = available["Public Shipping & Tools/Serve product image"]
+    remote_paths = [{"path": path, "bucket": None} for path in args.path or []]
+    records = []
+    phase_seconds = {}
+
+    def upload(entry):
+        body = multipart_file_body("image", entry["file"], args.chunk_size)
+        prepared = prepare_request(upload_item, variables)
+        prepared["headers"] = {"Content-Type": body["content_type"], "Content-Length": str(body["length"])}
+        prepared["body"] = body["chunks"]
+        response = client.send(prepared, tokens.get("admin"))
+        record = {
+            "direction": "upload",
+            "bucket": entry["bucket"],
+            "ok": is_success(response),
+            "elapsed_ms": response["elapsed_ms"],
+            "ttfb_ms": response["ttfb_ms"],
+            "bytes": entry["size"],
+        }
+        if record["ok"]:
+            try:
+                record["path"] = (json.loads(response["body"]).get("data") or {}).get("path")
+            except ValueError:
+                pass
+        return record
+
+    if "admin" in tokens:
+        started = time.perf_counter()
+        uploaded = run_concurrently(upload, corpus * args.uploads, args.concurrency)
+        phase_seconds["upload"] = time.perf_counter() - started
+        for record in uploaded:
+            records.append(record)
+            if record.get("path"):
+                remote_paths.append({"path": record["path"], "bucket": record["bucket"]})
+    elif args.uploads:
+        print("warning: uploads skipped without an admin token", file=sys.stderr)
+
+    unique_paths = list({entry["path"]: entry for entry in remote_paths}.values())
+    buffers = threading.local()
+
+    def download(entry):
+        buffer = getattr(buffers, "buffer", None)
+        if buffer is None:
+            buffer = buffers.buffer = bytearray(args.chunk_size)
+        prepared = prepare_request(download_item, dict(variables, image_path=entry["path"]))
+        response = client.send(prepared, buffer=buffer)
+        return {
+            "direction": "download",
+            "bucket": entry["bucket"] or size_bucket(response["bytes"]),
+            "ok": is_success(response),
+            "elapsed_ms": response["elapsed_ms"],
+            "ttfb_ms": response["ttfb_ms"],
+            "bytes": response["bytes"],
+        }
+
+    started = time.perf_counter()
+    records.extend(run_concurrently(download, unique_paths * args.downloads, args.concurrency))
+    phase_seconds["download"] = time.perf_counter() - started
+
+    grouped = {}
+    for record in records:
+        grouped.setdefault((record["direction"], record["bucket"]), []).append(record)
+    bucket_order = [label for _, label in SIZE_BUCKETS]
+    rows = []
+    report = {"mode": "images", "corpus": corpus, "buckets": {}, "phases": {}}
+    for direction, bucket in sorted(grouped, key=lambda key: (key[0], bucket_order.index(key[1]))):
+        summary = transfer_summary(grouped[(direction, bucket)], phase_seconds[direction])
+        report["buckets"][f"{direction}:{bucket}"] = summary
+        rows.append(
+            [
+                direction,
+                bucket,
+                summary["requests"],
+                summary["errors"],
+                format_optional(summary["mb_per_s"], "{:.2f}"),
+                format_optional(summary["stream_mb_per_s"], "{:.2f}"),
+                format_ms(summary["ttfb"].get("p50")),
+                format_ms(summary["ttfb"].get("p95")),
+                format_ms(summary["latency"].get("p50")),
+                format_ms(summary["latency"].get("p95")),
+                format_ms(summary["latency"].get("p99")),
+            ]
+        )
+    print_table(
+        [
+            "direction",
+            "size",
+            "requests",
+            "errors",
+            "wall MB/s",
+            "stream MB/s",
+            "ttfb p50",
+            "ttfb p95",
+            "p50",
+            "p95",
+            "p99",
+        ],
+        rows,
+    )
+    for direction, seconds in phase_seconds.items():
+        summary = transfer_summary([record for record in records if record["direction"] == direction], seconds)
+        if not summary["requests"]:
+            continue
+        report["phases"][direction] = summary
+        print(
+            f"{direction}: {format_bytes(summary['bytes'])} in {seconds:.2f}s wall clock, "
+            f"{format_optional(summary['mb_per_s'], '{:.2f}')} MB/s at concurrency {args.concurrency}"
+        )
+
+    if args.output:
+        write_results(args.output, report)
+    return 0
+
+
+def customer_csv_chunks(rows, merchant_index, rows_per_chunk):
+    yield CUSTOMER_CSV_HEADER.encode("utf-8")
+    for start in range(0, rows, rows_per_chunk):
+        lines = []
+        for row in range(start, min(start + rows_per_chunk, rows)):
+            lines.append(
+                f"Customer {merchant_index}-{row},05{row:08d},customer{row}.m{merchant_index}@example.com,"
+                f"load test,Street {row % 500},{CUSTOMER_CITIES[row % len(CUSTOMER_CITIES)]},{row % 90000 + 10000},IL\n"
+            )
+        yield "".join(lines).encode("utf-8")
+
+
+def write_customer_csv(path, rows, merchant_index, rows_per_chunk):
+    with open(path, "wb") as f:
+        for chunk in customer_csv_chunks(rows, merchant_index, rows_per_chunk):
+            f.write(chunk)
+    return path
+
+
+def multipart_stream_body(field, path, content_type, chunk_size, fields=None, on_complete=None):
+    filename = Path(path).name
+    boundary = uuid.uuid4().hex
+    preamble = "".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+        for name, value in (fields or {}).items()
+    )
+    head = (
+        f"{preamble}--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    def stream():
+        yield head
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+        yield tail
+        if on_complete:
+            on_complete()
+
+    return {
+        "content_type": f"multipart/form-data; boundary={boundary}",
+        "length": len(head) + Path(path).stat().st_size + len(tail),
+        "chunks": stream(),
+    }
+
+
+def classify_failure(response):
+    if response["status"] == 0:
+        return "timeout" if "timeout" in (response["error"] or "").lower() else "connection"
+    if response["status"] == 413:
+        return "payload_too_large"
+    if any(marker in response["body"] for marker in MEMORY_ERROR_MARKERS):
+        return "memory"
+    if response["status"] in (502, 503, 504):
+        return "gateway"
+    return f"http_{response['status']}"
+
+
+def import_senders(client, variables, args):
+    senders = []
+    for index, credentials in enumerate(args.merchant or []):
+        email, _, password = credentials.partition("=")
+        token = login_with_credentials(client, email, password)
+        if token:
+            senders.append({"label": email, "token": token, "fields": {}, "index": index})
+        else:
+            print(f"warning: login failed for merchant {email}", file=sys.stderr)
+    if args.merchant_user_id:
+        admin = role_tokens(client, variables, ["admin"], parse_assignments(args.token)).get("admin")
+        for merchant_user_id in args.merchant_user_id:
+            if admin:
+                senders.append(
+                    {
+                        "label": f"admin->{merchant_user_id}",
+                        "token": admin,
+                        "fields": {"merchant_user_id": merchant_user_id},
+                        "index": len(senders),
+                    }
+                )
+    if not senders:
+        for email, password in collection_merchants(variables):
+            token = login_with_credentials(client, email, password)
+            if token:
+                senders.append({"label": email, "token": token, "fields": {}, "index": len(senders)})
+    return senders
+
+
+def run_customers_import(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    item = items_by_key(collection).get("Merchant/Import merchant customers")
+    if item is None:
+        print("'Merchant/Import merchant customers' is not in the collection", file=sys.stderr)
+        return 1
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    senders = import_senders(client, variables, args)
+    if not senders:
+        print("no merchant could be authenticated", file=sys.stderr)
+        return 1
+
+    def upload(task):
+        sender, rows, path = task
+        marks = {}
+        body = multipart_stream_body(
+            "file",
+            path,
+            "text/csv",
+            UPLOAD_CHUNK_SIZE,
+            fields=sender["fields"],
+            on_complete=lambda: marks.setdefault("sent", time.perf_counter()),
+        )
+        prepared = prepare_request(item, variables)
+        prepared["headers"] = {"Content-Type": body["content_type"], "Content-Length": str(body["length"])}
+        prepared["body"] = body["chunks"]
+        started = time.perf_counter()
+        response = client.send(prepared, sender["token"])
+        upload_ms = (marks.get("sent", started) - started) * 1000
+        record = {
+            "merchant": sender["label"],
+            "rows": rows,
+            "bytes": body["length"],
+            "ok": is_success(response),
+            "elapsed_ms": response["elapsed_ms"],
+            "upload_ms": upload_ms,
+            "processing_ms": None if response["ttfb_ms"] is None else max(response["ttfb_ms"] - upload_ms, 0.0),
+            "failure": None,
+            "imported": None,
+        }
+        if record["ok"]:
+            try:
+                record["imported"] = (json.loads(response["body"]).get("data") or {}).get("imported")
+            except ValueError:
+                pass
+        else:
+            record["failure"] = classify_failure(response)
+        return record
+
+    rows_report = []
+    report = {"mode": "customers-import", "merchants": [sender["label"] for sender in senders], "sizes": {}}
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            files = {
+                sender["index"]: write_customer_csv(
+                    Path(directory) / f"customers-{rows}.m{sender['index']}.csv",
+                    rows,
+                    sender["index"],
+                    args.rows_per_chunk,
+                )
+                for sender in senders
+            }
+            tasks = [(sender, rows, files[sender["index"]]) for sender in senders for _ in range(args.repeat)]
+            records = run_concurrently(upload, tasks, len(tasks))
+        successes = [record for record in records if record["ok"]]
+        failures = {}
+        for record in records:
+            if record["failure"]:
+                failures[record["failure"]] = failures.get(record["failure"], 0) + 1
+        upload_summary = summarize([record["upload_ms"] for record in successes])
+        processing_summary = summarize([record["processing_ms"] for record in successes])
+        imported = sum(record["imported"] or 0 for record in successes)
+        processing_seconds = sum(record["processing_ms"] for record in successes) / 1000
+        report["sizes"][str(rows)] = {
+            "bytes": records[0]["bytes"],
+            "records": records,
+            "upload": upload_summary,
+            "processing": processing_summary,
+            "rows_per_s": imported / processing_seconds if processing_seconds else None,
+            "failures": failures,
+        }
+        rows_report.append(
+            [
+                rows,
+                f"{records[0]['bytes'] / (1024 * 1024):.1f}",
+                len(records),
+                format_ms(upload_summary.get("p50")),
+                format_ms(processing_summary.get("p50")),
+                format_ms(processing_summary.get("max")),
+                "-" if not processing_seconds else f"{imported / processing_seconds:.0f}",
+                ", ".join(f"{name}={count}" for name, count in sorted(failures.items())) or "-",
+            ]
+        )
+        print(f"{rows} rows: {len(successes)}/{len(records)} imports succeeded", file=sys.stderr)
+
+    print_table(
+        ["rows", "MB", "uploads", "upload p50", "processing p50", "processing max", "rows/s", "failures"],
+        rows_report,
+    )
+    if args.output:
+        write_results(args.output, report)
+    return 0
+
+
+def broadcast_log_count(client, item, variables, token, status):
+    response = send_item(
+        client,
+        item,
+        variables,
+        token,
+        query={"event_key": BROADCAST_EVENT_KEY, "status": status, "per_page": "1"},
+    )
+    data = response_data(response) if is_success(response) else None
+    return (data or {}).get("total") if isinstance(data, dict) else None
+
+
+def populate_email_list(client, available, variables, token, list_id, emails, args):
+    item = available["Admin/Email/Add email list contacts"]
+    list_variables = dict(variables, email_list_id=str(list_id))
+    batches = [emails[start:start + args.batch_size] for start in range(0, len(emails), args.batch_size)]
+
+    def add_batch(batch):
+        contacts = [{"type": "manual", "name": email.split("@")[0], "email": email} for email in batch]
+        return send_item(client, item, list_variables, token, payload={"contacts": contacts})
+
+    started = time.perf_counter()
+    responses = run_concurrently(add_batch, batches, args.concurrency)
+    return {
+        "seconds": time.perf_counter() - started,
+        "batches": len(batches),
+        "errors": sum(1 for response in responses if not is_success(response)),
+        "latency": summarize([response["elapsed_ms"] for response in responses]),
+    }
+
+
+def run_email_broadcast(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    available = items_by_key(collection)
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    token = role_tokens(client, variables, ["admin"], parse_assignments(args.token)).get("admin")
+    if not token:
+        print("an admin token is required for the email endpoints", file=sys.stderr)
+        return 1
+
+    stub = None
+    if not args.no_inforu_stub:
+        stub = start_inforu_stub(
+            args.inforu_host,
+            args.inforu_port,
+            latency_ms=args.inforu_latency_ms,
+            failure_rate=args.inforu_failure_rate,
+        )
+        print(
+            f"Inforu stand-in listening on {stub_url(stub)}; run the API with "
+            f"INFORU_BASE_URL={stub_url(stub)} and a non-empty INFORU_BASIC_AUTH.",
+            file=sys.stderr,
+        )
+
+    logs_item = available["Admin/Email/Email logs"]
+    run_id = uuid.uuid4().hex[:8]
+    rows = []
+    report = {"mode": "email-broadcast", "run_id": run_id, "sizes": {}}
+    for size in args.sizes:
+        response = send_item(
+            client,
+            available["Admin/Email/Create email list"],
+            variables,
+            token,
+            payload={"name": f"load-{run_id}-{size}", "description": "collection runner broadcast load test"},
+        )
+        list_id = (response_data(response) or {}).get("id") if is_success(response) else None
+        if not list_id:
+            print(f"could not create an email list for size {size} (HTTP {response['status']})", file=sys.stderr)
+            continue
+
+        emails = [f"load{index}.{run_id}@example.com" for index in range(size)]
+        population = populate_email_list(client, available, variables, token, list_id, emails, args)
+
+        baseline = {
+            status: broadcast_log_count(client, logs_item, variables, token, status) or 0
+            for status in ("sent", "failed")
+        }
+        received_before = len(stub.stub["received"]) if stub else 0
+        started = time.perf_counter()
+        broadcast = send_item(
+            client,
+            available["Admin/Email/Broadcast email"],
+            variables,
+            token,
+            payload={"subject": f"Load test {run_id} ({size})", "body": "בדיקת עומס", "emails": emails},
+        )
+        broadcast_seconds = time.perf_counter() - started
+
+        processed = {"sent": 0, "failed": 0}
+        finished = None
+        deadline = started + args.poll_timeout
+        while time.perf_counter() < deadline:
+            for status in processed:
+                count = broadcast_log_count(client, logs_item, variables, token, status)
+                if count is not None:
+                    processed[status] = count - baseline[status]
+            if processed["sent"] + processed["failed"] >= size:
+                finished = time.perf_counter()
+                break
+            time.sleep(args.poll_interval)
+
+        end_to_end = (finished or time.perf_counter()) - started
+        received = stub.stub["received"][received_before:] if stub else []
+        summary = {
+            "list_id": list_id,
+            "population": population,
+            "contacts_per_s": size / population["seconds"] if population["seconds"] else None,
+            "broadcast_status": broadcast["status"],
+            "broadcast_seconds": broadcast_seconds,
+            "end_to_end_seconds": end_to_end,
+            "completed": finished is not None,
+            "sent": processed["sent"],
+            "failed": processed["failed"],
+            "sent_per_s": processed["sent"] / end_to_end if end_to_end else None,
+            "provider_requests": len(received),
+        }
+        report["sizes"][str(size)] = summary
+        rows.append(
+            [
+                size,
+                f"{population['seconds']:.1f}",
+                "-" if summary["contacts_per_s"] is None else f"{summary['contacts_per_s']:.0f}",
+                population["errors"],
+                broadcast["status"],
+                f"{broadcast_seconds:.1f}",
+                f"{end_to_end:.1f}" + ("" if finished else " (timeout)"),
+                processed["sent"],
+                processed["failed"],
+                "-" if summary["sent_per_s"] is None else f"{summary['sent_per_s']:.1f}",
+                len(received) if stub else "-",
+            ]
+        )
+
+    if stub:
+        stub.shutdown()
+    print_table(
+        [
+            "list size",
+            "populate s",
+            "contacts/s",
+            "batch errors",
+            "broadcast",
+            "request s",
+            "end-to-end s",
+            "sent",
+            "failed",
+            "sent/s",
+            "stub hits",
+        ],
+        rows,
+    )
+    if args.output:
+        write_results(args.output, report)
+    return 0
+
+
+def jain_index(values):
+    values = [value for value in values if value is not None]
+    if not values or not any(values):
+        return None
+    return sum(values) ** 2 / (len(values) * sum(value * value for value in values))
+
+
+def plugin_merchants(variables, args):
+    merchants = []
+    for credentials in args.merchant or []:
+        email, _, password = credentials.partition("=")
+        merchants.append((email, password))
+    return merchants or collection_merchants(variables)
+
+
+def plugin_tenants(client, available, variables, args):
+    if args.tenants:
+        with Path(args.tenants).open(encoding="utf-8") as f:
+            definitions = json.load(f)
+    else:
+        merchants = plugin_merchants(variables, args)
+        if not merchants:
+            return []
+        definitions = []
+        for index in range(args.sites):
+            email, password = merchants[index % len(merchants)]
+            definitions.append(
+                {
+                    "site_url": args.site_url_pattern.format(index=index),
+                    "email": email,
+                    "password": password,
+                }
+            )
+
+    tenants = []
+    for index, definition in enumerate(definitions):
+        token = definition.get("token") or login_with_credentials(client, definition["email"], definition["password"])
+        if not token:
+            print(f"warning: no token for tenant {definition['site_url']}", file=sys.stderr)
+            continue
+        tenant_variables = dict(variables, plugin_site_url=definition["site_url"])
+        tenant_variables.update(definition.get("variables") or {})
+        if args.provision:
+            response = send_item(client, available["Plugin Integrations/Plugin Site - Create"], tenant_variables, token)
+            if not is_success(response) and response["status"] != 422:
+                print(
+                    f"warning: provisioning {definition['site_url']} returned HTTP {response['status']}",
+                    file=sys.stderr,
+                )
+        tenants.append({"index": index, "site_url": definition["site_url"], "token": token, "variables": tenant_variables})
+    return tenants
+
+
+def run_plugin(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    available = items_by_key(collection)
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+
+    weights = {name: weight for name, (_, weight) in PLUGIN_MIX.items()}
+    for name, weight in parse_assignments(args.mix).items():
+        if name not in PLUGIN_MIX:
+            raise SystemExit(f"Unknown plugin mix entry {name!r}; expected one of {', '.join(PLUGIN_MIX)}")
+        weights[name] = float(weight)
+    mix = [(name, available[PLUGIN_MIX[name][0]], weight) for name, weight in weights.items() if weight > 0]
+
+    tenants = plugin_tenants(client, available, variables, args)
+    if not tenants:
+        print("no plugin tenants could be authenticated", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter() + 1.0
+    finished = started + args.duration
+
+    def tenant_loop(tenant):
+        rng = random.Random(args.seed * 1_000_003 + tenant["index"])
+        records = []
+        scheduled = started + rng.uniform(0, 1 / args.rate)
+        while scheduled < finished:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name, item, _ = rng.choices(mix, weights=[weight for _, _, weight in mix])[0]
+            tenant_variables = tenant["variables"]
+            if name == "order":
+                order_number = f"LOAD-{tenant['index']}-{len(records)}-{uuid.uuid4().hex[:6]}"
+                tenant_variables = dict(tenant_variables, plugin_order_number=order_number)
+            sent_at = time.perf_counter()
+            response = client.send(prepare_request(item, tenant_variables), tenant["token"])
+            records.append(
+                {
+                    "endpoint": name,
+                    "ok": is_success(response),
+                    "status": response["status"],
+                    "latency_ms": (time.perf_counter() - scheduled) * 1000,
+                    "service_ms": response["elapsed_ms"],
+                    "lag_ms": max(sent_at - scheduled, 0.0) * 1000,
+                }
+            )
+            scheduled += rng.expovariate(args.rate)
+        return records
+
+    print(f"running {len(tenants)} tenants at {args.rate}/s each for {args.duration}s", file=sys.stderr)
+    results = run_concurrently(tenant_loop, tenants, len(tenants))
+
+    lags = [record["lag_ms"] for records in results for record in records]
+    endpoint_samples = {}
+    tenant_rows = []
+    throughputs = []
+    mean_latencies = []
+    report = {"mode": "plugin", "tenants": {}, "endpoints": {}, "mix": weights}
+    for tenant, records in zip(tenants, results):
+        for record in records:
+            endpoint = endpoint_samples.setdefault(
+                record["endpoint"], {"samples": [], "service": [], "errors": 0, "statuses": {}}
+            )
+            status = str(record["status"])
+            endpoint["statuses"][status] = endpoint["statuses"].get(status, 0) + 1
+            if record["ok"]:
+                endpoint["samples"].append(record["latency_ms"])
+                endpoint["service"].append(record["service_ms"])
+            else:
+                endpoint["errors"] += 1
+        latencies = [record["latency_ms"] for record in records if record["ok"]]
+        tenant_lags = [record["lag_ms"] for record in records]
+        summary = summarize(latencies)
+        throughput = len(latencies) / args.duration
+        throughputs.append(throughput)
+        mean_latencies.append(summary.get("mean"))
+        report["tenants"][tenant["site_url"]] = {
+            "requests": len(records),
+            "errors": len(records) - len(latencies),
+            "throughput": throughput,
+            "latency": summary,
+            "schedule_lag_p95": percentile(tenant_lags, 95),
+        }
+        tenant_rows.append(
+            [
+                tenant["site_url"],
+                len(records),
+                len(records) - len(latencies),
+                f"{throughput:.2f}",
+                format_ms(summary.get("p50")),
+                format_ms(summary.get("p95")),
+                format_ms(summary.get("p99")),
+                format_ms(percentile(tenant_lags, 95)),
+            ]
+        )
+
+    rows = []
+    for name in PLUGIN_MIX:
+        if name not in endpoint_samples:
+            continue
+        endpoint = endpoint_samples[name]
+        summary = summarize(endpoint["samples"])
+        service = summarize(endpoint["service"])
+        report["endpoints"][name] = {
+            "latency": summary,
+            "service": service,
+            "errors": endpoint["errors"],
+            "statuses": endpoint["statuses"],
+        }
+        rows.append(
+            [
+                name,
+                summary["count"] + endpoint["errors"],
+                endpoint["errors"],
+                format_ms(summary.get("p50")),
+                format_ms(summary.get("p95")),
+                format_ms(summary.get("p99")),
+                format_ms(summary.get("max")),
+                format_ms(service.get("p95")),
+            ]
+        )
+    print("latency is measured from each request's scheduled send time; service is send to response")
+    print_table(["endpoint", "requests", "errors", "p50", "p95", "p99", "max", "service p95"], rows)
+    print()
+
+    tenant_rows.sort(key=lambda row: float("inf") if row[6] == "-" else -float(row[6]))
+    print_table(
+        ["tenant (worst p99 first)", "requests", "errors", "req/s", "p50", "p95", "p99", "lag p95"],
+        tenant_rows[: args.show_tenants],
+    )
+    report["schedule_lag"] = summarize(lags)
+    print(
+        "\nschedule lag: p50={} p95={} max={} (time requests waited behind a tenant's previous request)".format(
+            format_ms(report["schedule_lag"].get("p50")),
+            format_ms(report["schedule_lag"].get("p95")),
+            format_ms(report["schedule_lag"].get("max")),
+        )
+    )
+
+    p99s = [entry["latency"].get("p99") for entry in report["tenants"].values() if entry["latency"].get("p99")]
+    report["fairness"] = {
+        "throughput_jain": jain_index(throughputs),
+        "latency_jain": jain_index(mean_latencies),
+        "p99_spread": max(p99s) / min(p99s) if p99s else None,
+    }
+    fairness = report["fairness"]
+    print(
+        "\nfairness: throughput Jain={} latency Jain={} p99 max/min={}".format(
+            "-" if fairness["throughput_jain"] is None else f"{fairness['throughput_jain']:.3f}",
+            "-" if fairness["latency_jain"] is None else f"{fairness['latency_jain']:.3f}",
+            "-" if fairness["p99_spread"] is None else f"{fairness['p99_spread']:.2f}",
+        )
+    )
+    if args.output:
+        write_results(args.output, report)
+    return 0
+
+
+def header_bytes(response):
+    return sum(len(name) + len(value) + 4 for name, value in response["headers"].items()) + 17
+
+
+def sample_payloads(client, requests, samples, interval):
+    responses = [[] for _ in requests]
+    started = last_round = time.perf_counter()
+    for round_index in range(samples):
+        if round_index:
+            time.sleep(max(started + round_index * interval - time.perf_counter(), 0.0))
+            last_round = time.perf_counter()
+        for sampled, (prepared, token) in zip(responses, requests):
+            sampled.append(client.send(prepared, token))
+    spacing = (last_round - started) / (samples - 1) if samples > 1 else None
+    return responses, spacing
+
+
+def profile_payload(client, prepared, token, responses):
+    successful = [response for response in responses if response["status"] == 200]
+    profile = {
+        "requests": len(responses),
+        "errors": len(responses) - len(successful),
+        "status": responses[-1]["status"],
+    }
+    if not successful:
+        return profile
+
+    last = successful[-1]
+    digests = [hashlib.sha256(response["body"]).digest() for response in successful]
+    unchanged = sum(1 for previous, current in zip(digests, digests[1:]) if previous == current)
+    profile.update(
+        {
+            "bytes": statistics.fmean(len(response["body"]) for response in successful),
+            "header_bytes": header_bytes(last),
+            "gzip_bytes": statistics.fmean(len(gzip.compress(response["body"], 6)) for response in successful),
+            "brotli_bytes": (
+                statistics.fmean(len(brotli.compress(response["body"])) for response in successful)
+                if brotli
+                else None
+            ),
+            "unchanged_ratio": unchanged / (len(digests) - 1) if len(digests) > 1 else None,
+            "etag": last["headers"].get("etag"),
+            "last_modified": last["headers"].get("last-modified"),
+            "latency": summarize([response["elapsed_ms"] for response in successful]),
+        }
+    )
+
+    conditional = {}
+    if profile["etag"]:
+        conditional["If-None-Match"] = profile["etag"]
+    if profile["last_modified"]:
+        conditional["If-Modified-Since"] = profile["last_modified"]
+    profile["conditional_status"] = None
+    if conditional:
+        revalidation = dict(prepared, headers=dict(prepared["headers"], **conditional))
+        response = client.send(revalidation, token)
+        profile["conditional_status"] = response["status"]
+        profile["not_modified_bytes"] = header_bytes(response) + len(response["body"])
+    return profile
+
+
+def polling_bytes_per_minute(profile, polls_per_minute):
+    unchanged = profile["unchanged_ratio"] or 0.0
+    compressed = profile["brotli_bytes"] or profile["gzip_bytes"]
+    revalidated = profile["not_modified_bytes"] if profile["conditional_status"] == 304 else profile["header_bytes"]
+    return {
+        "identity": polls_per_minute * (profile["bytes"] + profile["header_bytes"]),
+        "compressed": polls_per_minute * (compressed + profile["header_bytes"]),
+        "conditional": polls_per_minute
+        * ((1 - unchanged) * (compressed + profile["header_bytes"]) + unchanged * revalidated),
+    }
+
+
+def format_bytes(value):
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+def run_payload(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    tokens = role_tokens(client, variables, args.roles, parse_assignments(args.token))
+    items = select_items(collection, args.folder, {"GET"})
+    poll_interval = 60 / args.polls_per_minute
+    interval = poll_interval if args.sample_interval is None else args.sample_interval
+    requests = [(prepare_request(item, variables), tokens.get(item_role(item, args.role))) for item in items]
+    if args.samples > 1 and interval:
+        print(
+            f"sampling {len(items)} items {args.samples} times, {interval:g}s apart "
+            f"(about {interval * (args.samples - 1):.1f}s)",
+            file=sys.stderr,
+        )
+    sampled, spacing = sample_payloads(client, requests, args.samples, interval)
+    upper_bound = spacing is not None and spacing < poll_interval
+
+    rows = []
+    totals = {"identity": 0.0, "compressed": 0.0, "conditional": 0.0}
+    report = {
+        "mode": "payload",
+        "polls_per_minute": args.polls_per_minute,
+        "sample_spacing_s": spacing,
+        "unchanged_upper_bound": upper_bound,
+        "items": {},
+        "totals": totals,
+    }
+    for item, (prepared, token), responses in zip(items, requests, sampled):
+        profile = profile_payload(client, prepared, token, responses)
+        report["items"][item["key"]] = profile
+        if "bytes" not in profile:
+            rows.append([item["key"], profile["status"], "-", "-", "-", "-", "-", "-", "-", "-"])
+            continue
+        per_minute = polling_bytes_per_minute(profile, args.polls_per_minute)
+        profile["bytes_per_minute"] = per_minute
+        for name, value in per_minute.items():
+            totals[name] += value
+        validators = "/".join(
+            label for label, present in (("ETag", profile["etag"]), ("LM", profile["last_modified"])) if present
+        )
+        rows.append(
+            [
+                item["key"],
+                profile["status"],
+                format_bytes(profile["bytes"]),
+                format_bytes(profile["gzip_bytes"]),
+                format_bytes(profile["brotli_bytes"]),
+                validators or "none",
+                profile["conditional_status"] or "-",
+                "-" if profile["unchanged_ratio"] is None else f"{profile['unchanged_ratio'] * 100:.0f}%",
+                format_bytes(per_minute["identity"]),
+                format_bytes(per_minute["conditional"]),
+            ]
+        )
+    print_table(
+        [
+            "item",
+            "status",
+            "body",
+            "gzip",
+            "brotli",
+            "validators",
+            "revalidate",
+            "unchanged (max)" if upper_bound else "unchanged",
+            "bytes/min",
+            "cond/min",
+        ],
+        rows,
+    )
+
+    if totals["identity"]:
+        print(
+            f"\nat {args.polls_per_minute} polls/min per item: {format_bytes(totals['identity'])}/min uncompressed, "
+            f"{format_bytes(totals['compressed'])}/min compressed "
+            f"({(1 - totals['compressed'] / totals['identity']) * 100:.0f}% saved), "
+            f"{format_bytes(totals['conditional'])}/min with conditional requests honoured "
+            f"({(1 - totals['conditional'] / totals['identity']) * 100:.0f}% saved)"
+        )
+    if upper_bound:
+        print(
+            f"samples were {spacing:.2f}s apart, closer than the {poll_interval:.2f}s polling interval: "
+            "unchanged ratios and conditional savings are upper bounds",
+            file=sys.stderr,
+        )
+    if brotli is None:
+        print("brotli sizes skipped: install the 'brotli' package to compute them", file=sys.stderr)
+    if args.output:
+        write_results(args.output, report)
+    return 0
+
+
+def parse_server_timing(value):
+    timings = {}
+    for metric in (value or "").split(","):
+        parts = [part.strip() for part in metric.split(";")]
+        name = parts[0].lower()
+        for parameter in parts[1:]:
+            key, _, raw = parameter.partition("=")
+            if key.strip().lower() != "dur":
+                continue
+            try:
+                timings[name] = timings.get(name, 0.0) + float(raw.strip().strip('"'))
+            except ValueError:
+                pass
+    timings.pop("", None)
+    return timings
+
+
+def header_number(headers, names):
+    for name in names:
+        try:
+            return float(headers[name].strip().removesuffix("ms"))
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+def server_costs(headers):
+    timings = parse_server_timing(headers.get("server-timing"))
+    costs = {}
+    database = [duration for name, duration in timings.items() if name in SERVER_TIMING_DB_NAMES]
+    if database:
+        costs["db_ms"] = sum(database)
+    elif header_number(headers, DB_TIME_HEADERS) is not None:
+        costs["db_ms"] = header_number(headers, DB_TIME_HEADERS)
+    totals = [duration for name, duration in timings.items() if name in SERVER_TIMING_TOTAL_NAMES]
+    if totals:
+        costs["app_ms"] = max(totals)
+    if header_number(headers, QUERY_COUNT_HEADERS) is not None:
+        costs["queries"] = header_number(headers, QUERY_COUNT_HEADERS)
+    if headers.get("phpdebugbar-id"):
+        costs["debugbar_id"] = headers["phpdebugbar-id"]
+    if headers.get("x-clockwork-id"):
+        costs["clockwork_id"] = headers["x-clockwork-id"]
+    return costs
+
+
+def fetch_debug_costs(client, costs, token):
+    if "clockwork_id" in costs:
+        path = f"/__clockwork/{quote(costs['clockwork_id'])}"
+    elif "debugbar_id" in costs:
+        path = f"/_debugbar/open?{urlencode({'op': 'get', 'id': costs['debugbar_id']})}"
+    else:
+        return costs
+    response = client.send({"key": "debug", "method": "GET", "path": path, "headers": {}, "body": None}, token)
+    try:
+        payload = json.loads(response["body"]) if is_success(response) else {}
+    except ValueError:
+        payload = {}
+    if not isinstance(payload, dict):
+        return costs
+
+    if "clockwork_id" in costs:
+        found = {
+            "db_ms": payload.get("databaseDuration"),
+            "queries": payload.get("databaseQueriesCount"),
+            "app_ms": payload.get("responseDuration"),
+        }
+    else:
+        queries = payload.get("queries") or {}
+        timing = payload.get("time") or {}
+        found = {
+            "db_ms": queries.get("accumulated_duration") and queries["accumulated_duration"] * 1000,
+            "queries": queries.get("nb_statements"),
+            "app_ms": timing.get("duration") and timing["duration"] * 1000,
+        }
+    for name, value in found.items():
+        if value is not None and name not in costs:
+            costs[name] = value
+    return costs
+
+
+def parse_shard(value):
+    index, separator, total = (value or "1/1").partition("/")
+    try:
+        index, total = int(index), int(total)
+    except ValueError:
+        raise SystemExit(f"Expected --shard K/N, got {value!r}")
+    if not separator or total < 1 or not 1 <= index <= total:
+        raise SystemExit(f"Expected --shard K/N with 1 <= K <= N, got {value!r}")
+    return index, total
+
+
+def stable_shard(key, total):
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big") % total
+
+
+def histogram_bucket(elapsed_ms):
+    return max(0, math.ceil(math.log(max(elapsed_ms, 0.001) * 1000, HISTOGRAM_GROWTH)))
+
+
+def histogram_value(bucket):
+    return HISTOGRAM_GROWTH ** bucket / 1000
+
+
+def histogram_percentile(histogram, pct):
+    total = sum(histogram.values())
+    if not total:
+        return None
+    threshold = total * pct / 100
+    seen = 0
+    for bucket in sorted(histogram, key=int):
+        seen += histogram[bucket]
+        if seen >= threshold:
+            return histogram_value(int(bucket))
+    return histogram_value(int(max(histogram, key=int)))
+
+
+def new_server_result():
+    return {
+        "responses": 0,
+        "client_ms": 0.0,
+        "db_ms": 0.0,
+        "db_responses": 0,
+        "app_ms": 0.0,
+        "app_responses": 0,
+        "app_client_ms": 0.0,
+        "queries": 0.0,
+        "query_responses": 0,
+        "max_queries": 0,
+        "histograms": {"db": {}, "app": {}},
+    }
+
+
+def new_item_result(item):
+    return {
+        "method": item["method"],
+        "count": 0,
+        "errors": 0,
+        "statuses": {},
+        "samples": [],
+        "histogram": {},
+        "server": new_server_result(),
+    }
+
+
+def add_to_histogram(histogram, elapsed_ms):
+    bucket = str(histogram_bucket(elapsed_ms))
+    histogram[bucket] = histogram.get(bucket, 0) + 1
+
+
+def merge_histogram(target, source):
+    for bucket, count in source.items():
+        target[bucket] = target.get(bucket, 0) + count
+
+
+def record_server_costs(server, costs, client_ms):
+    if not any(name in costs for name in ("db_ms", "app_ms", "queries")):
+        return
+    server["responses"] += 1
+    server["client_ms"] += client_ms
+    if "db_ms" in costs:
+        server["db_ms"] += costs["db_ms"]
+        server["db_responses"] += 1
+        add_to_histogram(server["histograms"]["db"], costs["db_ms"])
+    if "app_ms" in costs:
+        server["app_ms"] += costs["app_ms"]
+        server["app_responses"] += 1
+        server["app_client_ms"] += client_ms
+        add_to_histogram(server["histograms"]["app"], costs["app_ms"])
+    if "queries" in costs:
+        server["queries"] += costs["queries"]
+        server["query_responses"] += 1
+        server["max_queries"] = max(server["max_queries"], costs["queries"])
+
+
+def record_response(result, response, keep_samples=True, costs=None):
+    status = str(response["status"])
+    result["statuses"][status] = result["statuses"].get(status, 0) + 1
+    if not is_success(response):
+        result["errors"] += 1
+        return
+    result["count"] += 1
+    add_to_histogram(result["histogram"], response["elapsed_ms"])
+    if keep_samples:
+        result["samples"].append(round(response["elapsed_ms"], 3))
+    if costs is None:
+        costs = server_costs(response["headers"])
+    record_server_costs(result["server"], costs, response["elapsed_ms"])
+
+
+def merge_item_results(target, source):
+    target["count"] += source["count"]
+    target["errors"] += source["errors"]
+    for status, count in source["statuses"].items():
+        target["statuses"][status] = target["statuses"].get(status, 0) + count
+    merge_histogram(target["histogram"], source["histogram"])
+    target["samples"].extend(source["samples"])
+    server = source.get("server") or new_server_result()
+    for name in SERVER_RESULT_TOTALS:
+        target["server"][name] += server.get(name, 0)
+    target["server"]["max_queries"] = max(target["server"]["max_queries"], server["max_queries"])
+    for name, histogram in server["histograms"].items():
+        merge_histogram(target["server"]["histograms"][name], histogram)
+    return target
+
+
+def item_summary(result):
+    if result["samples"] and len(result["samples"]) == result["count"]:
+        summary = summarize(result["samples"])
+    else:
+        summary = {"count": result["count"]}
+        for pct in PERCENTILES:
+            summary[f"p{pct}"] = histogram_percentile(result["histogram"], pct)
+    summary["errors"] = result["errors"]
+    return summary
+
+
+def build_results(mode, items, started_at, finished_at, shard=(1, 1), **extra):
+    return {
+        "format": RESULTS_FORMAT,
+        "mode": mode,
+        "shards": [{"index": shard[0], "total": shard[1], "started_at": started_at, "finished_at": finished_at}],
+        "duration_s": finished_at - started_at,
+        "throughput": sum(result["count"] for result in items.values()) / (finished_at - started_at),
+        "items": items,
+        **extra,
+    }
+
+
+def load_results(path):
+    with Path(path).open(encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get("format") != RESULTS_FORMAT:
+        raise SystemExit(f"{path} is not a collection runner result file")
+    return results
+
+
+def merge_results(results_list):
+    merged_items = {}
+    shards = []
+    for results in results_list:
+        shards.extend(results["shards"])
+        for key, result in results["items"].items():
+            target = merged_items.setdefault(key, dict(new_item_result(result), method=result["method"]))
+            merge_item_results(target, result)
+    started_at = min(shard["started_at"] for shard in shards)
+    finished_at = max(shard["finished_at"] for shard in shards)
+    merged = build_results(results_list[0]["mode"], merged_items, started_at, finished_at)
+    merged["shards"] = sorted(shards, key=lambda shard: shard["index"])
+    merged["shard_throughput"] = sum(results["throughput"] for results in results_list)
+    return merged
+
+
+def print_item_summaries(results):
+    rows = []
+    for key, result in sorted(results["items"].items()):
+        summary = item_summary(result)
+        rows.append(
+            [
+                key,
+                result["method"],
+                summary["count"],
+                summary["errors"],
+                format_ms(summary.get("p50")),
+                format_ms(summary.get("p95")),
+                format_ms(summary.get("p99")),
+                f"{summary['count'] / results['duration_s']:.2f}",
+            ]
+        )
+    print_table(["item", "method", "ok", "errors", "p50", "p95", "p99", "req/s"], rows)
+    print(f"\nthroughput: {results['throughput']:.2f} req/s over {results['duration_s']:.1f}s")
+
+
+def shard_plan(items, users, shard, split):
+    index, total = shard
+    if split == "items":
+        items = [item for item in items if stable_shard(item["key"], total) == index - 1]
+        return items, list(range(users))
+    return items, [user for user in range(users) if user % total == index - 1]
+
+
+def parse_think_times(values):
+    think_times = []
+    for value in values or []:
+        folder, separator, spec = value.rpartition("=")
+        kind, *numbers = spec.split(":")
+        if not separator or kind not in THINK_DISTRIBUTIONS:
+            raise SystemExit(f"invalid think time {value!r}; expected FOLDER=KIND:ARGS")
+        try:
+            parameters = [float(number) for number in numbers]
+        except ValueError:
+            raise SystemExit(f"invalid think time {value!r}; arguments must be numbers") from None
+        if len(parameters) != THINK_DISTRIBUTIONS[kind][0]:
+            raise SystemExit(f"{kind} think time takes {THINK_DISTRIBUTIONS[kind][0]} argument(s)")
+        think_times.append((folder.strip("/"), kind, parameters))
+    return sorted(think_times, key=lambda entry: (entry[0] != "*", len(entry[0])), reverse=True)
+
+
+def think_time(think_times, item, rng):
+    for folder, kind, parameters in think_times:
+        if folder == "*" or item["folder"] == folder or item["folder"].startswith(folder + "/"):
+            return max(THINK_DISTRIBUTIONS[kind][1](rng, *parameters), 0.0) / 1000
+    return 0.0
+
+
+def is_steady(window_p95s, windows, stability):
+    recent = window_p95s[-windows:]
+    if len(recent) < windows or None in recent:
+        return False
+    mean = statistics.fmean(recent)
+    return mean > 0 and (max(recent) - min(recent)) / mean * 100 <= stability
+
+
+def run_warmup(args, client, prepared, users, user_requests):
+    started = time.perf_counter()
+    coverage = run_concurrently(
+        lambda entry: client.send(entry[1], entry[2]),
+        prepared,
+        max(min(len(users), len(prepared)), 1),
+    )
+    coverage_errors = sum(not is_success(response) for response in coverage)
+    print(f"warm-up: covered {len(coverage)} items ({coverage_errors} errors)", file=sys.stderr)
+
+    limit = args.warmup if args.warmup is not None else DEFAULT_STEADY_STATE_CAP
+    window_p95s = []
+    steady = False
+    if limit > 0 and prepared:
+        stop = threading.Event()
+        lock = threading.Lock()
+        window = []
+
+        def warm_user(user):
+            for _, _, response in user_requests(user, lambda step, steps_per_pass: not stop.is_set()):
+                if is_success(response):
+                    with lock:
+                        window.append(response["elapsed_ms"])
+
+        with ThreadPoolExecutor(max_workers=max(len(users), 1)) as executor:
+            futures = [executor.submit(warm_user, user) for user in users]
+            traffic_started = time.perf_counter()
+            try:
+                while time.perf_counter() - traffic_started < limit:
+                    time.sleep(min(args.window if args.steady_state else limit, limit))
+                    with lock:
+                        window_p95s.append(percentile(window, 95))
+                        window.clear()
+                    if args.steady_state:
+                        print(f"warm-up window p95: {format_ms(window_p95s[-1])} ms", file=sys.stderr)
+                        if is_steady(window_p95s, args.stable_windows, args.stability):
+                            steady = True
+                            break
+            finally:
+                stop.set()
+            for future in futures:
+                future.result()
+
+    duration = time.perf_counter() - started
+    if args.steady_state and not steady:
+        print(f"warning: p95 did not settle within {limit:g}s of warm-up", file=sys.stderr)
+    print(f"warm-up: finished after {duration:.1f}s", file=sys.stderr)
+    return {
+        "duration_s": duration,
+        "coverage_requests": len(coverage),
+        "coverage_errors": coverage_errors,
+        "window_p95_ms": window_p95s,
+        "steady": steady,
+    }
+
+
+def run_load(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    shard = parse_shard(args.shard)
+    items = [
+        item
+        for item in select_items(collection, args.folder, set(args.method))
+        if not item["key"].startswith(LOAD_EXCLUDED_FOLDERS)
+    ]
+    items, users = shard_plan(items, args.users, shard, args.split)
+    if not items or not users:
+        print(f"shard {shard[0]}/{shard[1]} has no work", file=sys.stderr)
+    tokens = role_tokens(client, variables, args.roles, parse_assignments(args.token))
+    prepared = [(item, prepare_request(item, variables), tokens.get(item_role(item, args.role))) for item in items]
+
+    think_times = parse_think_times(args.think)
+
+    def user_requests(user, keep_going):
+        order = list(range(len(prepared)))
+        rng = random.Random(args.seed * 1_000_003 + user)
+        rng.shuffle(order)
+        step = 0
+        while prepared and keep_going(step, len(order)):
+            item, request, token = prepared[order[step % len(order)]]
+            yield item, token, client.send(request, token)
+            pause = think_time(think_times, item, rng)
+            if pause:
+                time.sleep(pause)
+            step += 1
+
+    print(
+        f"shard {shard[0]}/{shard[1]}: {len(users)} users over {len(items)} items",
+        file=sys.stderr,
+    )
+    warmup = None
+    if args.warmup is not None or args.steady_state:
+        warmup = run_warmup(args, client, prepared, users, user_requests)
+
+    started_at = time.time()
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def keep_measuring(step, steps_per_pass):
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return step < args.iterations * steps_per_pass
+
+    def user_loop(user):
+        results = {item["key"]: new_item_result(item) for item in items}
+        for item, token, response in user_requests(user, keep_measuring):
+            costs = server_costs(response["headers"])
+            if args.fetch_debug and is_success(response):
+                costs = fetch_debug_costs(client, costs, token)
+            record_response(results[item["key"]], response, not args.no_samples, costs)
+        return results
+
+    user_results = run_concurrently(user_loop, users, max(len(users), 1))
+    finished_at = time.time()
+
+    items_results = {item["key"]: new_item_result(item) for item in items}
+    for results in user_results:
+        for key, result in results.items():
+            merge_item_results(items_results[key], result)
+    results = build_results(
+        "load",
+        items_results,
+        started_at,
+        finished_at,
+        shard=shard,
+        users=len(users),
+        split=args.split,
+        warmup=warmup,
+    )
+    print_item_summaries(results)
+    print_server_costs(results, args.show_costs)
+    if args.output:
+        write_results(args.output, results)
+    return 0
+
+
+def server_cost_rows(results):
+    rows = []
+    for key, result in results["items"].items():
+        server = result.get("server") or new_server_result()
+        if not server["responses"]:
+            continue
+        client_ms = server["client_ms"] / server["responses"]
+        app_ms = server["app_ms"] / server["app_responses"] if server["app_responses"] else None
+        app_client_ms = server.get("app_client_ms", 0.0) / server["app_responses"] if server["app_responses"] else None
+        outside_ms = max(app_client_ms - app_ms, 0.0) if app_ms is not None else None
+        rows.append(
+            {
+                "key": key,
+                "responses": server["responses"],
+                "client_ms": client_ms,
+                "db_ms": server["db_ms"] / server["db_responses"] if server["db_responses"] else None,
+                "db_p95": histogram_percentile(server["histograms"]["db"], 95),
+                "queries": server["queries"] / server["query_responses"] if server["query_responses"] else None,
+                "max_queries": server["max_queries"] if server["query_responses"] else None,
+                "app_ms": app_ms,
+                "outside_ms": outside_ms,
+                "outside_share": outside_ms / app_client_ms if outside_ms is not None and app_client_ms else None,
+            }
+        )
+    return rows
+
+
+def format_optional(value, template="{:.1f}"):
+    return "-" if value is None else template.format(value)
+
+
+def ranked(rows, field):
+    return sorted(rows, key=lambda row: -1 if row[field] is None else row[field], reverse=True)
+
+
+def print_server_costs(results, limit=None):
+    rows = server_cost_rows(results)
+    if not rows:
+        print("no Server-Timing, query-count or debug headers were returned", file=sys.stderr)
+        return rows
+
+    print()
+    print_table(
+        ["item (by DB time per request)", "responses", "db ms", "db p95", "queries", "max queries", "app ms"],
+        [
+            [
+                row["key"],
+                row["responses"],
+                format_optional(row["db_ms"]),
+                format_optional(row["db_p95"]),
+                format_optional(row["queries"]),
+                format_optional(row["max_queries"], "{:.0f}"),
+                format_optional(row["app_ms"]),
+            ]
+            for row in ranked(rows, "db_ms")[:limit]
+        ],
+    )
+    print()
+    print_table(
+        ["item (by time outside the app)", "client ms", "app ms", "outside ms", "outside share"],
+        [
+            [
+                row["key"],
+                format_optional(row["client_ms"]),
+                format_optional(row["app_ms"]),
+                format_optional(row["outside_ms"]),
+                format_optional(row["outside_share"] and row["outside_share"] * 100, "{:.0f}%"),
+            ]
+            for row in ranked(rows, "outside_share")[:limit]
+        ],
+    )
+    return rows
+
+
+def run_costs(args):
+    results = merge_results([load_results(path) for path in args.results])
+    print_server_costs(results, args.limit)
+    return 0
+
+
+def run_merge(args):
+    merged = merge_results([load_results(path) for path in args.results])
+    indexes = sorted(shard["index"] for shard in merged["shards"])
+    totals = {shard["total"] for shard in merged["shards"]}
+    if len(totals) == 1 and indexes != list(range(1, totals.pop() + 1)):
+        print(f"warning: merged shards {indexes} do not cover the whole run", file=sys.stderr)
+    print_item_summaries(merged)
+    print(f"sum of shard throughput: {merged['shard_throughput']:.2f} req/s across {len(merged['shards'])} shards")
+    if args.output:
+        write_results(args.output, merged)
+    return 0
+
+
+def item_values(result):
+    if result["samples"] and len(result["samples"]) == result["count"]:
+        return result["samples"]
+    values = []
+    for bucket, count in result["histogram"].items():
+        values.extend([histogram_value(int(bucket))] * count)
+    return values
+
+
+def percentiles_of(ordered, percentiles):
+    return {pct: percentile(ordered, pct, presorted=True) for pct in percentiles}
+
+
+def bootstrap_deltas(baseline, candidate, percentiles, iterations, confidence, rng):
+    deltas = {pct: [] for pct in percentiles}
+    for _ in range(iterations):
+        before = percentiles_of(sorted(rng.choices(baseline, k=len(baseline))), percentiles)
+        after = percentiles_of(sorted(rng.choices(candidate, k=len(candidate))), percentiles)
+        for pct in percentiles:
+            deltas[pct].append(after[pct] - before[pct])
+    tail = (1 - confidence) / 2
+    intervals = {}
+    for pct, values in deltas.items():
+        values.sort()
+        intervals[pct] = (
+            values[int(tail * (iterations - 1))],
+            values[int(math.ceil((1 - tail) * (iterations - 1)))],
+        )
+    return intervals
+
+
+def compare_item(key, baseline, candidate, args, rng):
+    before_values = item_values(baseline["items"][key])
+    after_values = item_values(candidate["items"][key])
+    if len(before_values) > args.max_samples:
+        before_values = rng.sample(before_values, args.max_samples)
+    if len(after_values) > args.max_samples:
+        after_values = rng.sample(after_values, args.max_samples)
+    comparison = {
+        "key": key,
+        "counts": (len(before_values), len(after_values)),
+        "throughput": (
+            baseline["items"][key]["count"] / baseline["duration_s"],
+            candidate["items"][key]["count"] / candidate["duration_s"],
+        ),
+        "regressions": [],
+    }
+    if min(comparison["counts"]) < args.min_samples:
+        comparison["verdict"] = "insufficient samples"
+        return comparison
+
+    comparison["before"] = percentiles_of(sorted(before_values), PERCENTILES)
+    comparison["after"] = percentiles_of(sorted(after_values), PERCENTILES)
+    comparison["intervals"] = bootstrap_deltas(
+        before_values,
+        after_values,
+        PERCENTILES,
+        args.bootstrap,
+        args.confidence,
+        rng,
+    )
+    for pct in GATED_PERCENTILES:
+        if min(comparison["counts"]) * (100 - pct) / 100 < args.min_tail:
+            continue
+        before = comparison["before"][pct]
+        delta = comparison["after"][pct] - before
+        lower = comparison["intervals"][pct][0]
+        if lower > 0 and delta > before * args.threshold / 100:
+            comparison["regressions"].append(f"p{pct}")
+    comparison["verdict"] = "REGRESSION " + "/".join(comparison["regressions"]) if comparison["regressions"] else "ok"
+    return comparison
+
+
+def format_change(before, after):
+    if before is None or after is None:
+        return "-"
+    change = f"{after - before:+.1f}"
+    if before:
+        change += f" ({(after - before) / before * 100:+.0f}%)"
+    return change
+
+
+def print_comparisons(comparisons, baseline, candidate):
+    rows = []
+    for comparison in comparisons:
+        row = [comparison["key"], "{}/{}".format(*comparison["counts"])]
+        for pct in (50, 95, 99):
+            if "before" not in comparison:
+                row.append("-")
+                continue
+            lower, upper = comparison["intervals"][pct]
+            row.append(
+                f"{format_ms(comparison['before'][pct])}->{format_ms(comparison['after'][pct])} "
+                f"[{lower:+.1f}, {upper:+.1f}]"
+            )
+        row.append(format_change(*comparison["throughput"]))
+        row.append(comparison["verdict"])
+        rows.append(row)
+    print_table(["item", "samples", "p50 ms [CI]", "p95 ms [CI]", "p99 ms [CI]", "req/s", "verdict"], rows)
+    print(
+        f"\nthroughput: {baseline['throughput']:.2f} -> {candidate['throughput']:.2f} req/s "
+        f"({format_change(baseline['throughput'], candidate['throughput'])})"
+    )
+    for label, results, other in (("baseline", baseline, candidate), ("candidate", candidate, baseline)):
+        missing = sorted(set(results["items"]) - set(other["items"]))
+        if missing:
+            print(f"only in {label}: {', '.join(missing)}")
+
+
+def current_branch():
+    for name in CI_BRANCH_VARIABLES:
+        if os.environ.get(name):
+            return os.environ[name]
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        output = ""
+    if not output or output == "HEAD":
+        raise SystemExit(
+            f"cannot tell the current branch (detached checkout?); pass --branch or set one of {', '.join(CI_BRANCH_VARIABLES)}"
+        )
+    return output
+
+
+def baseline_path(directory, branch):
+    return Path(directory) / f"{re.sub(r'[^A-Za-z0-9._-]+', '-', branch)}.json"
+
+
+def run_compare(args):
+    if len(args.results) > 2:
+        raise SystemExit("compare takes a candidate result file, optionally preceded by a baseline file")
+    candidate = load_results(args.results[-1])
+    stored = None
+    if len(args.results) == 1 or args.save_baseline:
+        stored = baseline_path(args.baseline_dir, args.branch or current_branch())
+    if len(args.results) == 2:
+        baseline = load_results(args.results[0])
+    elif stored.exists():
+        baseline = load_results(stored)
+        print(f"comparing against stored baseline {stored}", file=sys.stderr)
+    elif args.save_baseline:
+        baseline = None
+    else:
+        raise SystemExit(f"no stored baseline at {stored}; pass two result files or use --save-baseline")
+
+    regressions = []
+    if baseline is not None:
+        rng = random.Random(args.seed)
+        shared = sorted(set(baseline["items"]) & set(candidate["items"]))
+        comparisons = [compare_item(key, baseline, candidate, args, rng) for key in shared]
+        print_comparisons(comparisons, baseline, candidate)
+        regressions = [comparison for comparison in comparisons if comparison["regressions"]]
+        if regressions:
+            print(
+                f"\n{len(regressions)} item(s) regressed beyond {args.threshold:g}% "
+                f"at {args.confidence:.0%} confidence",
+                file=sys.stderr,
+            )
+
+    if args.save_baseline and not regressions:
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        write_results(stored, candidate)
+        print(f"saved baseline {stored}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def is_lock_error(response):
+    body = response["body"] or b""
+    return any(marker in body for marker in LOCK_ERROR_MARKERS)
+
+
+def create_shipments(client, available, variables, token, run_id, first, count, args):
+    def create(index):
+        order = send_item(client, available["Orders/Create order"], variables, token)
+        order_id = (response_data(order) or {}).get("id") if is_success(order) else None
+        if not order_id:
+            return None, f"order HTTP {order['status']}"
+        tracking_number = f"LOAD-{run_id}-{index:06d}"
+        shipment_variables = dict(variables, order_id=order_id, tracking_number=tracking_number)
+        payload = json.loads(prepare_request(available["Shipments/Create shipment"], shipment_variables)["body"])
+        payload.update(cod_payment=True, cod_amount=args.cod_amount, cod_method="cash")
+        shipment = send_item(client, available["Shipments/Create shipment"], shipment_variables, token, payload)
+        shipment_id = (response_data(shipment) or {}).get("id") if is_success(shipment) else None
+        if not shipment_id:
+            return None, f"shipment HTTP {shipment['status']}"
+        return {"id": shipment_id, "tracking_number": tracking_number}, None
+
+    created = run_concurrently(create, range(first, first + count), args.writers)
+    failures = {}
+    for _, error in created:
+        if error:
+            failures[error] = failures.get(error, 0) + 1
+    for error, total in failures.items():
+        print(f"warning: {total} shipment(s) not created ({error})", file=sys.stderr)
+    return [shipment for shipment, _ in created if shipment]
+
+
+def burst_operations(shipments, args, rng):
+    operations = []
+    cod_requests = round(args.burst_size * args.cod_share)
+    for _ in range(args.burst_size - cod_requests):
+        operations.append(("tracking", [rng.choice(shipments)]))
+    for _ in range(cod_requests):
+        operations.append(("cod", rng.sample(shipments, min(args.cod_batch, len(shipments)))))
+    rng.shuffle(operations)
+    return operations
+
+
+def summarize_responses(responses, spike_ms=None):
+    elapsed = [response["elapsed_ms"] for response in responses if response["status"]]
+    summary = summarize(elapsed)
+    summary["requests"] = len(responses)
+    summary["server_errors"] = sum(response["status"] >= 500 for response in responses)
+    summary["failed"] = sum(not is_success(response) for response in responses)
+    summary["lock_errors"] = sum(is_lock_error(response) for response in responses)
+    if spike_ms is not None:
+        summary["spikes"] = sum(value > spike_ms for value in elapsed)
+    return summary
+
+
+def read_until(send, users, seconds, stop=None):
+    if stop is None and seconds <= 0:
+        return []
+    responses = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds if seconds > 0 else None
+
+    def reader(user):
+        rng = random.Random(user)
+        while not (stop is not None and stop.is_set()) and (deadline is None or time.perf_counter() < deadline):
+            response = send(rng)
+            with lock:
+                responses.append(response)
+
+    run_concurrently(reader, range(users), users)
+    return responses
+
+
+def read_tracking(client, available, variables, shipments, users, seconds, stop=None):
+    item = available["Public Shipping & Tools/Track shipment (public)"]
+
+    def send(rng):
+        shipment = rng.choice(shipments)
+        return send_item(client, item, dict(variables, tracking_number=shipment["tracking_number"]))
+
+    return read_until(send, users, seconds, stop)
+
+
+def run_shipments(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    available = items_by_key(collection)
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    token = role_tokens(client, variables, ["admin"], parse_assignments(args.token)).get("admin")
+    if not token:
+        print("an admin token is required to create shipments and post tracking events", file=sys.stderr)
+        return 1
+
+    def write(operation):
+        kind, targets = operation
+        if kind == "cod":
+            return kind, len(targets), send_item(
+                client,
+                available["Shipments/Update COD collection status"],
+                variables,
+                token,
+                payload={"shipment_ids": [shipment["id"] for shipment in targets], "collected": True},
+            )
+        return kind, len(targets), send_item(
+            client,
+            available["Shipments/Add tracking event"],
+            dict(variables, shipment_id=targets[0]["id"]),
+            token,
+        )
+
+    run_id = uuid.uuid4().hex[:8]
+    rng = random.Random(args.seed)
+    shipments = []
+    rows = []
+    report = {"mode": "shipments", "run_id": run_id, "levels": {}}
+    for count in sorted(args.counts):
+        started = time.perf_counter()
+        shipments.extend(
+            create_shipments(client, available, variables, token, run_id, len(shipments), count - len(shipments), args)
+        )
+        setup_seconds = time.perf_counter() - started
+        if not shipments:
+            print("no shipments could be created", file=sys.stderr)
+            return 1
+        print(f"{len(shipments)} shipments ready after {setup_seconds:.1f}s", file=sys.stderr)
+
+        idle = summarize_responses(
+            read_tracking(client, available, variables, shipments, args.readers, args.baseline_seconds)
+        )
+        spike_ms = idle["p95"] * args.spike_factor if idle.get("p95") else None
+
+        stop = threading.Event()
+        writes = {"tracking": [], "cod": []}
+        cod_rows = {"targeted": 0, "updated": 0}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            reads = executor.submit(read_tracking, client, available, variables, shipments, args.readers, 0, stop)
+            try:
+                for burst in range(args.bursts):
+                    if burst:
+                        time.sleep(args.burst_interval)
+                    operations = burst_operations(shipments, args, rng)
+                    for kind, targeted, response in run_concurrently(write, operations, args.writers):
+                        writes[kind].append(response)
+                        if kind == "cod":
+                            cod_rows["targeted"] += targeted
+                            if is_success(response):
+                                cod_rows["updated"] += (response_data(response) or {}).get("updated") or 0
+            finally:
+                stop.set()
+            busy = summarize_responses(reads.result(), spike_ms)
+
+        tracking = summarize_responses(writes["tracking"])
+        cod = summarize_responses(writes["cod"])
+        cod.update(rows_targeted=cod_rows["targeted"], rows_updated=cod_rows["updated"])
+        if cod_rows["targeted"] and not cod_rows["updated"]:
+            print(
+                f"warning: COD bursts at {len(shipments)} shipments updated no rows; "
+                "the shipments are probably not COD shipments",
+                file=sys.stderr,
+            )
+        report["levels"][str(len(shipments))] = {
+            "setup_seconds": setup_seconds,
+            "idle_reads": idle,
+            "reads_during_bursts": busy,
+            "tracking_events": tracking,
+            "cod_updates": cod,
+        }
+        rows.append(
+            [
+                len(shipments),
+                format_ms(tracking.get("p95")),
+                format_ms(cod.get("p95")),
+                f"{cod_rows['updated']}/{cod_rows['targeted']}",
+                tracking["server_errors"] + cod["server_errors"],
+                tracking["lock_errors"] + cod["lock_errors"],
+                f"{format_ms(idle.get('p95'))} -> {format_ms(busy.get('p95'))}",
+                format_ms(busy.get("p99")),
+                format_ms(busy.get("max")),
+                busy.get("spikes", "-"),
+                busy["server_errors"],
+                busy["lock_errors"],
+            ]
+        )
+
+    print_table(
+        [
+            "shipments",
+            "event p95",
+            "cod p95",
+            "cod rows updated",
+            "write 5xx",
+            "write locks",
+            "read p95 idle -> burst",
+            "read p99",
+            "read max",
+            f"spikes >{args.spike_factor:g}x",
+            "read 5xx",
+            "read locks",
+        ],
+        rows,
+    )
+    if args.output:
+        write_results(args.output, report)
+    return 0
+
+
+def stub_traffic(stub, mark, path):
+    entries = [entry for entry in stub.stub["received"][mark:] if entry[1] == path]
+    return len(entries), sum(entry[2] for entry in entries)
+
+
+def timed_sync(client, item, variables, token, payload=None):
+    started = time.perf_counter()
+    response = send_item(client, item, variables, token, payload=payload)
+    return {
+        "status": response["status"],
+        "seconds": time.perf_counter() - started,
+        "data": (response_data(response) or {}) if is_success(response) else {},
+        "lock_error": is_lock_error(response),
+        "error": response["error"],
+    }
+
+
+def read_storefront(client, prepared, users, seconds, stop=None):
+    def send(rng):
+        _, request, token = rng.choice(prepared)
+        return client.send(request, token)
+
+    return read_until(send, users, seconds, stop) if prepared else []
+
+
+def sync_cashcow_orders(client, item, variables, token, args):
+    started = time.perf_counter()
+    totals = {"pages": 0, "orders": 0, "created": 0, "updated": 0, "skipped": 0, "failed_pages": 0}
+    for page in range(1, args.order_pages + 1):
+        result = timed_sync(client, item, variables, token, payload={"page": page, "page_size": args.order_page_size})
+        if result["status"] != 200:
+            totals["failed_pages"] += 1
+            print(f"warning: Cashcow order sync page {page} returned HTTP {result['status']}", file=sys.stderr)
+            break
+        received = result["data"].get("orders_received") or 0
+        totals["pages"] += 1
+        totals["orders"] += received
+        for field in ("created", "updated", "skipped"):
+            totals[field] += result["data"].get(field) or 0
+        if received < args.order_page_size:
+            break
+    totals["seconds"] = time.perf_counter() - started
+    totals["orders_per_s"] = totals["orders"] / totals["seconds"] if totals["seconds"] else None
+    return totals
+
+
+def catalog_skus(client, item, variables, token, limit):
+    skus = []
+    page = 1
+    while len(skus) < limit:
+        response = send_item(client, item, variables, token, query={"page": str(page), "per_page": "100"})
+        data = response_data(response) if is_success(response) else None
+        if not isinstance(data, dict) or not data.get("data"):
+            break
+        skus.extend(product["sku"] for product in data["data"] if product.get("sku"))
+        if page >= (data.get("last_page") or page):
+            break
+        page += 1
+    return skus[:limit]
+
+
+def run_cashcow_sync(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    available = items_by_key(collection)
+    client = HttpClient(variables["base_url"], timeout=args.timeout)
+    tokens = role_tokens(client, variables, args.roles, parse_assignments(args.token))
+    if "admin" not in tokens:
+        print("an admin token is required to trigger the sync endpoints", file=sys.stderr)
+        return 1
+
+    inventory_item = available["Admin/Products/Sync Cashcow Inventory"]
+    orders_item = available["Orders/Sync Cashcow orders"]
+    reads = [
+        (available[key], prepare_request(available[key], variables), tokens.get(item_role(available[key], "admin")))
+        for key in args.read_item or STOREFRONT_INVENTORY_ITEMS
+        if key in available
+    ]
+
+    skus = catalog_skus(client, available["Public Catalog/List products"], variables, tokens["admin"], max(args.products))
+    if not skus:
+        print("the API returned no product SKUs; seed products before timing the sync", file=sys.stderr)
+        return 1
+
+    stub = start_cashcow_stub(
+        args.cashcow_host,
+        args.cashcow_port,
+        products=0,
+        orders=args.orders,
+        latency_ms=args.cashcow_latency_ms,
+        sku_prefix=args.sku_prefix,
+        skus=skus,
+    )
+    url = stub_url(stub)
+    print(
+        f"Cashcow/Toyland stand-in listening on {url}; run the API with CASHCOW_BASE_URL={url}, "
+        f"TOYLAND_INVENTORY_SYNC_URL={url}/toyland/inventory and non-empty CASHCOW_TOKEN/CASHCOW_STORE_ID. "
+        f"The first {len(skus)} catalog SKUs are the API's own; the rest look like {args.sku_prefix}0000001.",
+        file=sys.stderr,
+    )
+
+    report = {"mode": "cashcow-sync", "sizes": {}}
+    solo_rows = []
+    overlap_rows = []
+    for size in sorted(args.products):
+        stub.stub["products"] = size
+        stub.stub["generation"] += 1
+        mark = len(stub.stub["received"])
+        solo = timed_sync(client, inventory_item, variables, tokens["admin"])
+        if not solo["data"].get("products_updated"):
+            print(
+                f"error: the {size}-product sync updated no products (status {solo['status']}, "
+                f"{len(solo['data'].get('missing_products') or [])} missing SKUs); "
+                "check that the API is pointed at this stand-in",
+                file=sys.stderr,
+            )
+            stub.shutdown()
+            return 1
+        pages, served = stub_traffic(stub, mark, "/Api/Products/GetQty")
+        toyland = solo["data"].get("toyland_sync") or {}
+        solo.update(
+            pages=pages,
+            items_served=served,
+            items_per_s=served / solo["seconds"] if solo["seconds"] else None,
+        )
+        report["sizes"][str(size)] = {"solo": solo}
+        solo_rows.append(
+            [
+                size,
+                solo["status"],
+                f"{solo['seconds']:.1f}",
+                pages,
+                f"{solo['seconds'] / pages:.2f}" if pages else "-",
+                served,
+                "-" if solo["items_per_s"] is None else f"{solo['items_per_s']:.0f}",
+                solo["data"].get("products_updated", "-"),
+                solo["data"].get("variations_updated", "-"),
+                len(solo["data"].get("missing_products") or []),
+                f"{toyland.get('status', '-')} ({toyland.get('items_sent', 0)})",
+            ]
+        )
+        if args.no_overlap:
+            continue
+
+        idle = summarize_responses(read_storefront(client, reads, args.readers, args.baseline_seconds))
+        stub.stub["generation"] += 1
+        mark = len(stub.stub["received"])
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            reader = executor.submit(read_storefront, client, reads, args.readers, 0, stop)
+            try:
+                syncs = list(
+                    executor.map(
+                        lambda _: timed_sync(client, inventory_item, variables, tokens["admin"]),
+                        range(2),
+                    )
+                )
+            finally:
+                stop.set()
+            busy = summarize_responses(reader.result())
+        pages, served = stub_traffic(stub, mark, "/Api/Products/GetQty")
+        webhooks, _ = stub_traffic(stub, mark, "/toyland/inventory")
+        report["sizes"][str(size)]["overlap"] = {
+            "syncs": syncs,
+            "pages": pages,
+            "items_served": served,
+            "toyland_posts": webhooks,
+            "idle_reads": idle,
+            "reads_during_syncs": busy,
+        }
+        overlap_rows.append(
+            [
+                size,
+                " / ".join(f"{sync['status']} {sync['seconds']:.1f}s" for sync in syncs),
+                " / ".join(str(sync["data"].get("products_updated", "-")) for sync in syncs),
+                sum(sync["lock_error"] for sync in syncs),
+                f"{pages} ({pages / solo['pages']:.1f}x)" if solo["pages"] else pages,
+                webhooks,
+                f"{format_ms(idle.get('p95'))} -> {format_ms(busy.get('p95'))}",
+                format_ms(busy.get("max")),
+                busy["failed"],
+                busy["lock_errors"],
+            ]
+        )
+
+    print_table(
+        [
+            "catalog",
+            "status",
+            "wall s",
+            "pages",
+            "s/page",
+            "items",
+            "items/s",
+            "products",
+            "variations",
+            "missing",
+            "toyland",
+        ],
+        solo_rows,
+    )
+    if overlap_rows:
+        print()
+        print_table(
+            [
+                "catalog",
+                "two syncs",
+                "products updated",
+                "sync locks",
+                "pages fetched",
+                "toyland posts",
+                "read p95 idle -> overlap",
+                "read max",
+                "read errors",
+                "read locks",
+            ],
+            overlap_rows,
+        )
+    if args.orders:
+        report["orders"] = sync_cashcow_orders(client, orders_item, variables, tokens["admin"], args)
+        orders = report["orders"]
+        print(
+            f"\nCashcow orders: {orders['orders']} orders over {orders['pages']} pages in {orders['seconds']:.1f}s "
+            f"({format_ms(orders['orders_per_s'])} orders/s; {orders['created']} created, "
+            f"{orders['updated']} updated, {orders['skipped']} skipped)"
+        )
+
+    stub.shutdown()
+    if args.output:
+        write_results(args.output, report)
+    return 0
+
+
+class Http2Client:
+    def __init__(self, base_url, timeout=30.0, context=None):
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.Client(http2=True, timeout=timeout, verify=context or True)
+
+    def send(self, prepared, token=None, buffer=None):
+        headers = {"Accept": "application/json"}
+        headers.update(prepared["headers"])
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        started = time.perf_counter()
+        try:
+            response = self.client.request(
+                prepared["method"],
+                self.base_url + prepared["path"],
+                content=prepared["body"],
+                headers=headers,
+            )
+        except httpx.HTTPError as exc:
+            return {
+                "status": 0,
+                "elapsed_ms": (time.perf_counter() - started) * 1000,
+                "ttfb_ms": None,
+                "headers": {},
+                "body": b"",
+                "bytes": 0,
+                "handshake": None,
+                "error": f"{type(exc).__name__}: {exc}",
+            }
+        return {
+            "status": response.status_code,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+            "ttfb_ms": None,
+            "headers": {name.lower(): value for name, value in response.headers.items()},
+            "body": response.content,
+            "bytes": len(response.content),
+            "handshake": None,
+            "http_version": response.http_version,
+            "error": None,
+        }
+
+    def close(self):
+        self.client.close()
+
+
+def tls_context(args, cafile=None):
+    if args.insecure:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    return ssl.create_default_context(cafile=cafile)
+
+
+def probe_alpn(base_url, probe, timeout):
+    parts = urlsplit(base_url)
+    probe.set_alpn_protocols(["h2", "http/1.1"])
+    started = time.perf_counter()
+    with socket.create_connection((parts.hostname, parts.port or 443), timeout) as sock:
+        connected = time.perf_counter()
+        with probe.wrap_socket(sock, server_hostname=parts.hostname) as tls:
+            protocol = tls.selected_alpn_protocol()
+    return {
+        "protocol": protocol or "http/1.1",
+        "tcp_ms": (connected - started) * 1000,
+        "tls_ms": (time.perf_counter() - connected) * 1000,
+    }
+
+
+def connection_clients(args, base_url, context, cafile=None):
+    clients = {}
+    for strategy in args.strategies:
+        if strategy == "keep-alive":
+            clients[strategy] = (HttpClient(base_url, args.timeout, context=context), None)
+        elif strategy == "fresh":
+            clients[strategy] = (HttpClient(base_url, args.timeout, fresh=True, context=context), None)
+        elif httpx is None:
+            print("skipping http2: install httpx[http2] to enable it", file=sys.stderr)
+        elif not base_url.startswith("https://"):
+            print("skipping http2: it is only attempted over TLS", file=sys.stderr)
+        else:
+            probe = probe_alpn(base_url, tls_context(args, cafile), args.timeout)
+            if probe["protocol"] != "h2":
+                print(f"skipping http2: the server negotiated {probe['protocol']}", file=sys.stderr)
+            else:
+                clients[strategy] = (Http2Client(base_url, args.timeout, tls_context(args, cafile)), probe)
+    return clients
+
+
+def run_workload(client, prepared, items, users, args):
+    def user_loop(user):
+        results = {item["key"]: new_item_result(item) for item in items}
+        handshakes = {item["key"]: {"connections": 0, "tcp_ms": 0.0, "tls_ms": 0.0} for item in items}
+        order = list(range(len(prepared)))
+        random.Random(args.seed * 1_000_003 + user).shuffle(order)
+        for step in range(args.iterations * len(order)):
+            item, request, token = prepared[order[step % len(order)]]
+            response = client.send(request, token)
+            record_response(results[item["key"]], response, True, {})
+            if response["handshake"]:
+                handshake = handshakes[item["key"]]
+                handshake["connections"] += 1
+                handshake["tcp_ms"] += response["handshake"]["tcp_ms"]
+                handshake["tls_ms"] += response["handshake"]["tls_ms"] or 0.0
+        return results, handshakes
+
+    started_at = time.time()
+    outcomes = run_concurrently(user_loop, users, max(len(users), 1))
+    finished_at = time.time()
+    items_results = {item["key"]: new_item_result(item) for item in items}
+    handshakes = {item["key"]: {"connections": 0, "tcp_ms": 0.0, "tls_ms": 0.0} for item in items}
+    for results, user_handshakes in outcomes:
+        for key, result in results.items():
+            merge_item_results(items_results[key], result)
+            for field, value in user_handshakes[key].items():
+                handshakes[key][field] += value
+    results = build_results("connections", items_results, started_at, finished_at, users=len(users))
+    results["handshakes"] = handshakes
+    return results
+
+
+def format_delta(value, baseline):
+    if value is None or not baseline:
+        return ""
+    return f" ({(value - baseline) / baseline * 100:+.0f}%)"
+
+
+def item_rate(results, key):
+    elapsed_ms = sum(results["items"][key]["samples"])
+    return results["users"] * len(results["items"][key]["samples"]) * 1000 / elapsed_ms if elapsed_ms else None
+
+
+def print_connection_comparison(runs):
+    strategies = list(runs)
+    baseline = runs[strategies[0]]
+    rows = []
+    for key in sorted(baseline["items"]):
+        row = [key]
+        base = item_summary(baseline["items"][key])
+        base_rate = item_rate(baseline, key)
+        for strategy in strategies:
+            summary = item_summary(runs[strategy]["items"][key])
+            rate = item_rate(runs[strategy], key)
+            compared = strategy != strategies[0]
+            row.append(
+                f"{format_ms(summary.get('p50'))}/{format_ms(summary.get('p95'))}"
+                + (format_delta(summary.get("p50"), base.get("p50")) if compared else "")
+            )
+            row.append("-" if rate is None else f"{rate:.1f}" + (format_delta(rate, base_rate) if compared else ""))
+        handshake = max(
+            (runs[strategy]["handshakes"][key] for strategy in strategies),
+            key=lambda entry: entry["connections"],
+        )
+        row.append(
+            format_ms((handshake["tcp_ms"] + handshake["tls_ms"]) / handshake["connections"])
+            if handshake["connections"]
+            else "-"
+        )
+        rows.append(row)
+    headers = ["item"]
+    for strategy in strategies:
+        headers.extend([f"{strategy} p50/p95", f"{strategy} req/s"])
+    print_table([*headers, "handshake ms"], rows)
+    print("req/s per item is users / mean latency: the rate all users would sustain on that item alone")
+
+    print()
+    rows = []
+    for strategy, results in runs.items():
+        handshakes = results["handshakes"].values()
+        connections = sum(entry["connections"] for entry in handshakes)
+        tcp_ms = sum(entry["tcp_ms"] for entry in handshakes)
+        tls_ms = sum(entry["tls_ms"] for entry in handshakes)
+        elapsed_ms = sum(sum(result["samples"]) for result in results["items"].values())
+        probe = results.get("probe")
+        if probe:
+            connections, tcp_ms, tls_ms = 1, probe["tcp_ms"], probe["tls_ms"]
+        rows.append(
+            [
+                f"{strategy} (ALPN probe)*" if probe else strategy,
+                sum(result["count"] for result in results["items"].values()),
+                sum(result["errors"] for result in results["items"].values()),
+                f"{results['throughput']:.1f}" + format_delta(results["throughput"], baseline["throughput"]),
+                connections,
+                format_ms(tcp_ms / connections) if connections else "-",
+                format_ms(tls_ms / connections) if connections and tls_ms else "-",
+                f"{(tcp_ms + tls_ms) / elapsed_ms * 100:.0f}%" if elapsed_ms else "-",
+            ]
+        )
+    print_table(
+        ["strategy", "ok", "errors", "req/s", "connections", "tcp ms", "tls ms", "handshake share"],
+        rows,
+    )
+    if any(results.get("probe") for results in runs.values()):
+        print(
+            "* connections, tcp ms and tls ms come from a separate ALPN probe connection, "
+            "not from the connection the HTTP/2 client used"
+        )
+
+
+def run_connections(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection, parse_assignments(args.var))
+    stub = None
+    cafile = None
+    with tempfile.TemporaryDirectory() as directory:
+        if args.tls_stub:
+            cafile, _ = certificate = self_signed_certificate(directory)
+            stub = start_api_stub(
+                args.stub_host,
+                args.stub_port,
+                tls=certificate,
+                latency_ms=args.stub_latency_ms,
+                items=args.stub_items,
+            )
+            variables["base_url"] = stub_url(stub)
+            print(f"TLS stand-in listening on {variables['base_url']}", file=sys.stderr)
+        context = tls_context(args, cafile)
+
+        base_url = variables["base_url"]
+        setup = HttpClient(base_url, args.timeout, context=context)
+        tokens = role_tokens(setup, variables, args.roles, parse_assignments(args.token))
+        items = [
+            item
+            for item in select_items(collection, args.folder, set(args.method))
+            if not item["key"].startswith(LOAD_EXCLUDED_FOLDERS)
+        ]
+        prepared = [(item, prepare_request(item, variables), tokens.get(item_role(item, args.role))) for item in items]
+        users = list(range(args.users))
+
+        runs = {}
+        for strategy, (client, probe) in connection_clients(args, base_url, context, cafile).items():
+            print(f"{strategy}: {args.users} users x {args.iterations} passes over {len(items)} items", file=sys.stderr)
+            runs[strategy] = run_workload(client, prepared, items, users, args)
+            if probe:
+                runs[strategy]["probe"] = probe
+            if isinstance(client, Http2Client):
+                client.close()
+        if stub:
+            stub.shutdown()
+
+    if not runs:
+        print("no connection strategy could run", file=sys.stderr)
+        return 1
+    print_connection_comparison(runs)
+    if args.output:
+        write_results(args.output, {"mode": "connections", "base_url": base_url, "strategies": runs})
+    return 0
+
+
+def add_common_arguments(parser):
+    parser.add_argument("--collection", help="Collection JSON to run (defaults to the generated collection).")
+    parser.add_argument("--var", action="append", metavar="KEY=VALUE", help="Override a collection variable.")
+    parser.add_argument("--token", action="append", metavar="ROLE=TOKEN", help="Use a token instead of logging in.")
+    parser.add_argument("--roles", nargs="+", default=list(DEFAULT_ROLES), help="Roles to authenticate as.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--output", help="Write the JSON result file here.")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run performance modes against the generated KFitz API collection.")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    dashboard = subparsers.add_parser("dashboard", help="Cold/warm latency profile of the dashboard endpoints.")
+    add_common_arguments(dashboard)
+    dashboard.add_argument("--rounds", type=int, default=3, help="Cold/warm cycles per case.")
+    dashboard.add_argument("--warm", type=int, default=10, help="Warm requests after each cold request.")
+    dashboard.add_argument(
+        "--reset-command",
+        help="Shell command run before each cold request, e.g. 'php artisan optimize:clear'.",
+    )
+    dashboard.add_argument(
+        "--expect-ratio",
+        type=float,
+        help="Exit non-zero when an endpoint's cold/warm ratio falls below this value.",
+    )
+    dashboard.set_defaults(handler=run_dashboard)
+
+    images = subparsers.add_parser("images", help="Product image upload/download throughput by size bucket.")
+    add_common_arguments(images)
+    images.add_argument("--source", default=str(IMAGE_SOURCE_DIRECTORY), help="Directory of sample images.")
+    images.add_argument("--corpus", help="Load the image corpus from this JSON file instead of --source.")
+    images.add_argument("--write-corpus", help="Write the generated image corpus to this JSON file.")
+    images.add_argument("--path", action="append", help="Extra stored image path to download, e.g. images/a.jpg.")
+    images.add_argument("--uploads", type=int, default=1, help="Uploads per corpus image.")
+    images.add_argument("--downloads", type=int, default=5, help="Downloads per stored image path.")
+    images.add_argument("--concurrency", type=int, default=4, help="Parallel transfers.")
+    images.add_argument("--chunk-size", type=int, default=64 * 1024, help="Read/write chunk size in bytes.")
+    images.set_defaults(handler=run_images)
+
+    customers = subparsers.add_parser(
+        "customers-import",
+        help="Concurrent streamed CSV uploads to the merchant customer import.",
+    )
+    add_common_arguments(customers)
+    customers.set_defaults(timeout=900.0)
+    customers.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=list(CUSTOMER_IMPORT_ROWS),
+        help="CSV sizes to synthesize, in rows.",
+    )
+    customers.add_argument(
+        "--merchant",
+        action="append",
+        metavar="EMAIL=PASSWORD",
+        help="Merchant account to import as (defaults to the collection's merchant logins).",
+    )
+    customers.add_argument(
+        "--merchant-user-id",
+        action="append",
+        help="Import as admin on behalf of this merchant user id.",
+    )
+    customers.add_argument("--repeat", type=int, default=1, help="Uploads per merchant and size.")
+    customers.add_argument("--rows-per-chunk", type=int, default=5000, help="CSV rows generated per body chunk.")
+    customers.set_defaults(handler=run_customers_import)
+
+    email = subparsers.add_parser(
+        "email-broadcast",
+        help="Email list population and broadcast throughput against a local Inforu stand-in.",
+    )
+    add_common_arguments(email)
+    email.set_defaults(timeout=900.0)
+    email.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(BROADCAST_LIST_SIZES),
+        help="List sizes to populate and broadcast to.",
+    )
+    email.add_argument("--batch-size", type=int, default=500, help="Contacts per add-contacts request.")
+    email.add_argument("--concurrency", type=int, default=4, help="Parallel add-contacts requests.")
+    email.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between email log polls.")
+    email.add_argument("--poll-timeout", type=float, default=1800.0, help="Give up polling after this many seconds.")
+    email.add_argument("--inforu-host", default="127.0.0.1", help="Bind address of the Inforu stand-in.")
+    email.add_argument("--inforu-port", type=int, default=8025, help="Port of the Inforu stand-in.")
+    email.add_argument("--inforu-latency-ms", type=float, default=50.0, help="Simulated Inforu response time.")
+    email.add_argument("--inforu-failure-rate", type=float, default=0.0, help="Fraction of sends the stand-in rejects.")
+    email.add_argument("--no-inforu-stub", action="store_true", help="Do not start the Inforu stand-in.")
+    email.set_defaults(handler=run_email_broadcast)
+
+    plugin = subparsers.add_parser("plugin", help="Multi-tenant plugin storefront traffic profile.")
+    add_common_arguments(plugin)
+    plugin.add_argument("--sites", type=int, default=50, help="Simulated storefronts when --tenants is not given.")
+    plugin.add_argument(
+        "--tenants",
+        help="JSON list of tenants: {site_url, token | email+password, variables}.",
+    )
+    plugin.add_argument(
+        "--merchant",
+        action="append",
+        metavar="EMAIL=PASSWORD",
+        help="Merchant accounts the simulated sites are spread across.",
+    )
+    plugin.add_argument(
+        "--site-url-pattern",
+        default="https://loadtest-{index}.example.com",
+        help="site_url of simulated storefront {index}.",
+    )
+    plugin.add_argument("--provision", action="store_true", help="Create each simulated plugin site first.")
+    plugin.add_argument("--rate", type=float, default=1.0, help="Requests per second per tenant.")
+    plugin.add_argument("--duration", type=float, default=60.0, help="Seconds of traffic.")
+    plugin.add_argument(
+        "--mix",
+        action="append",
+        metavar="NAME=WEIGHT",
+        help=f"Override a request weight ({', '.join(PLUGIN_MIX)}).",
+    )
+    plugin.add_argument("--seed", type=int, default=1, help="Random seed for the traffic schedule.")
+    plugin.add_argument("--show-tenants", type=int, default=10, help="Tenants listed in the report.")
+    plugin.set_defaults(handler=run_plugin)
+
+    payload = subparsers.add_parser(
+        "payload",
+        help="Response size, compression and conditional-request profile of every GET item.",
+    )
+    add_common_arguments(payload)
+    payload.add_argument("--folder", action="append", help="Only profile items under this folder path.")
+    payload.add_argument("--role", default="admin", help="Role used for items outside role-specific folders.")
+    payload.add_argument("--samples", type=int, default=5, help="Requests per item used to detect unchanged bodies.")
+    payload.add_argument("--polls-per-minute", type=float, default=60.0, help="Polling rate per item for the report.")
+    payload.add_argument(
+        "--sample-interval",
+        type=float,
+        help="Seconds between samples of an item (default: the polling interval); "
+        "shorter spacing makes the unchanged ratio an upper bound.",
+    )
+    payload.set_defaults(handler=run_payload)
+
+    load = subparsers.add_parser("load", help="Run collection items with concurrent virtual users.")
+    add_common_arguments(load)
+    load.add_argument("--folder", action="append", help="Only run items under this folder path.")
+    load.add_argument("--method", nargs="+", default=["GET"], help="HTTP methods to include.")
+    load.add_argument("--role", default="admin", help="Role used for items outside role-specific folders.")
+    load.add_argument("--users", type=int, default=10, help="Virtual users across all shards.")
+    load.add_argument("--duration", type=float, help="Seconds to run; overrides --iterations.")
+    load.add_argument("--iterations", type=int, default=1, help="Passes over the item set per virtual user.")
+    load.add_argument("--seed", type=int, default=1, help="Seed for each virtual user's item order.")
+    load.add_argument("--shard", default="1/1", help="Run shard K of N, e.g. 3/8.")
+    load.add_argument(
+        "--split",
+        choices=["users", "items"],
+        default="users",
+        help="Shard the virtual users (every node runs every item) or the items (every node runs all users).",
+    )
+    load.add_argument("--no-samples", action="store_true", help="Keep only histograms in the result file.")
+    load.add_argument(
+        "--fetch-debug",
+        action="store_true",
+        help="Follow Debugbar/Clockwork request ids to read query counts and DB time.",
+    )
+    load.add_argument("--show-costs", type=int, default=20, help="Items listed in the server cost ranking.")
+    load.add_argument(
+        "--think",
+        action="append",
+        help="Think time after each request, FOLDER=KIND:ARGS in ms, e.g. 'Merchant=exp:800', "
+        "'Public Catalog=uniform:200:1500', '*=lognormal:400:0.6'; const, uniform, exp, normal, lognormal.",
+    )
+    load.add_argument(
+        "--warmup",
+        type=float,
+        help="Seconds of unrecorded warm-up traffic after one pass over every item (0 for the pass only).",
+    )
+    load.add_argument(
+        "--steady-state",
+        action="store_true",
+        help="End the warm-up once the rolling-window p95 is stable; --warmup becomes the cap.",
+    )
+    load.add_argument("--window", type=float, default=5.0, help="Steady-state window length in seconds.")
+    load.add_argument("--stable-windows", type=int, default=3, help="Consecutive windows that must agree.")
+    load.add_argument("--stability", type=float, default=10.0, help="Allowed p95 spread across windows in percent.")
+    load.set_defaults(handler=run_load)
+
+    merge = subparsers.add_parser("merge", help="Merge shard result files into global percentiles.")
+    merge.add_argument("results", nargs="+", help="Result files written by --output.")
+    merge.add_argument("--output", help="Write the merged result file here.")
+    merge.set_defaults(handler=run_merge)
+
+    costs = subparsers.add_parser(
+        "costs",
+        help="Rank items in result files by DB time per request and time spent outside the app.",
+    )
+    costs.add_argument("results", nargs="+", help="Result files (shards are merged first).")
+    costs.add_argument("--limit", type=int, help="Items listed per ranking.")
+    costs.set_defaults(handler=run_costs)
+
+    compare = subparsers.add_parser(
+        "compare",
+        help="Compare two result files per item and fail on significant p95/p99 regressions.",
+    )
+    compare.add_argument(
+        "results",
+        nargs="+",
+        help="BASELINE CANDIDATE, or just CANDIDATE to compare against the stored branch baseline.",
+    )
+    compare.add_argument(
+        "--branch",
+        help="Branch whose stored baseline is used (default: the CI branch variable, then the checked-out git branch).",
+    )
+    compare.add_argument(
+        "--baseline-dir",
+        default=str(BASELINE_DIRECTORY),
+        help="Directory of stored baselines, one BRANCH.json each; the default scripts/baselines is tracked so commit them.",
+    )
+    compare.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the candidate as the branch baseline when no regression is found.",
+    )
+    compare.add_argument("--threshold", type=float, default=5.0, help="Minimum p95/p99 increase in percent.")
+    compare.add_argument("--confidence", type=float, default=0.95, help="Bootstrap confidence level.")
+    compare.add_argument("--bootstrap", type=int, default=1000, help="Bootstrap resamples per item.")
+    compare.add_argument("--max-samples", type=int, default=2000, help="Samples per side used for resampling.")
+    compare.add_argument("--min-samples", type=int, default=30, help="Skip items with fewer samples.")
+    compare.add_argument(
+        "--min-tail",
+        type=int,
+        default=10,
+        help="Samples needed above a percentile before it can gate (p99 needs 1000 samples at 10).",
+    )
+    compare.add_argument("--seed", type=int, default=1)
+    compare.set_defaults(handler=run_compare)
+
+    shipments = subparsers.add_parser(
+        "shipments",
+        help="Fire tracking-event and COD status bursts at growing shipment counts while tracking reads run.",
+    )
+    add_common_arguments(shipments)
+    shipments.add_argument(
+        "--counts",
+        nargs="+",
+        type=int,
+        default=list(SHIPMENT_COUNTS),
+        help="Shipment totals to grow through; each level adds shipments to the previous ones.",
+    )
+    shipments.add_argument("--bursts", type=int, default=5, help="Write bursts per level.")
+    shipments.add_argument("--burst-size", type=int, default=200, help="Write requests per burst.")
+    shipments.add_argument("--burst-interval", type=float, default=2.0, help="Seconds between bursts.")
+    shipments.add_argument("--cod-share", type=float, default=0.2, help="Fraction of burst requests that are COD updates.")
+    shipments.add_argument("--cod-batch", type=int, default=50, help="Shipments per COD status update.")
+    shipments.add_argument("--cod-amount", type=float, default=359.7, help="COD amount of the created shipments.")
+    shipments.add_argument("--writers", type=int, default=20, help="Parallel write requests.")
+    shipments.add_argument("--readers", type=int, default=10, help="Concurrent public tracking readers.")
+    shipments.add_argument("--baseline-seconds", type=float, default=3.0, help="Idle read time before the bursts; 0 skips it.")
+    shipments.add_argument(
+        "--spike-factor",
+        type=float,
+        default=5.0,
+        help="Reads slower than this multiple of the idle p95 count as spikes.",
+    )
+    shipments.add_argument("--seed", type=int, default=1)
+    shipments.set_defaults(handler=run_shipments)
+
+    cashcow = subparsers.add_parser(
+        "cashcow-sync",
+        help="Time the Cashcow inventory and order syncs against a local Cashcow/Toyland stand-in.",
+    )
+    add_common_arguments(cashcow)
+    cashcow.set_defaults(timeout=7200.0, roles=["admin", "merchant"])
+    cashcow.add_argument(
+        "--products",
+        nargs="+",
+        type=int,
+        default=list(CASHCOW_CATALOG_SIZES),
+        help="Catalog sizes served by the stand-in.",
+    )
+    cashcow.add_argument("--orders", type=int, default=0, help="Orders served by the stand-in; 0 skips the order sync.")
+    cashcow.add_argument("--order-page-size", type=int, default=50, help="page_size sent to the order sync.")
+    cashcow.add_argument("--order-pages", type=int, default=1000, help="Stop the order sync after this many pages.")
+    cashcow.add_argument(
+        "--read-item",
+        action="append",
+        help="Storefront item read while two syncs overlap (default: product, product list, inventory snapshot).",
+    )
+    cashcow.add_argument("--readers", type=int, default=10, help="Concurrent storefront readers.")
+    cashcow.add_argument("--baseline-seconds", type=float, default=3.0, help="Idle read time before the overlap; 0 skips it.")
+    cashcow.add_argument("--no-overlap", action="store_true", help="Only time a single sync per catalog size.")
+    cashcow.add_argument("--cashcow-host", default="127.0.0.1", help="Bind address of the Cashcow stand-in.")
+    cashcow.add_argument("--cashcow-port", type=int, default=8026, help="Port of the Cashcow stand-in.")
+    cashcow.add_argument("--cashcow-latency-ms", type=float, default=20.0, help="Simulated Cashcow page latency.")
+    cashcow.add_argument(
+        "--sku-prefix",
+        default="CC-LOAD-",
+        help="Prefix of the synthetic SKUs served once the API's own product SKUs run out.",
+    )
+    cashcow.set_defaults(handler=run_cashcow_sync)
+
+    connections = subparsers.add_parser(
+        "connections",
+        help="Run the same workload with keep-alive, a new connection per request and HTTP/2.",
+    )
+    add_common_arguments(connections)
+    connections.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=CONNECTION_STRATEGIES,
+        default=list(CONNECTION_STRATEGIES),
+        help="Strategies to compare; the first is the baseline for deltas.",
+    )
+    connections.add_argument("--folder", action="append", help="Only run items under this folder path.")
+    connections.add_argument("--method", nargs="+", default=["GET"], help="HTTP methods to include.")
+    connections.add_argument("--role", default="admin", help="Role used for items outside role-specific folders.")
+    connections.add_argument("--users", type=int, default=10, help="Concurrent virtual users.")
+    connections.add_argument("--iterations", type=int, default=5, help="Passes over the item set per user.")
+    connections.add_argument("--seed", type=int, default=1, help="Seed for each virtual user's item order.")
+    connections.add_argument("--insecure", action="store_true", help="Skip TLS certificate verification.")
+    connections.add_argument(
+        "--tls-stub",
+        action="store_true",
+        help="Run against a local TLS stand-in with a throwaway self-signed certificate (needs openssl).",
+    )
+    connections.add_argument("--stub-host", default="127.0.0.1", help="Bind address of the TLS stand-in.")
+    connections.add_argument("--stub-port", type=int, default=0, help="Port of the TLS stand-in (0 picks one).")
+    connections.add_argument("--stub-latency-ms", type=float, default=2.0, help="Simulated handler time.")
+    connections.add_argument("--stub-items", type=int, default=20, help="List entries in each stand-in response.")
+    connections.set_defaults(handler=run_connections)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
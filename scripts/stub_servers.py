@@ -0,0 +1,311 @@
+import json
+import random
+import ssl
+import subprocess
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class InforuStubHandler(StubHandler):
+    def do_POST(self):
+        body = self.read_body()
+        if self.path.rstrip("/") != "/api/v2/Umail/Message/Send":
+            self.send_json(404, {"StatusId": -1, "StatusDescription": "Not found"})
+            return
+
+        stub = self.server.stub
+        if stub["latency_ms"]:
+            time.sleep(stub["latency_ms"] / 1000)
+        try:
+            data = json.loads(body).get("Data") or {}
+        except ValueError:
+            self.send_json(400, {"StatusId": -2, "StatusDescription": "Invalid JSON"})
+            return
+
+        recipients = len(data.get("IncludeContacts") or [])
+        failed = random.random() < stub["failure_rate"]
+        with stub["lock"]:
+            stub["received"].append((time.time(), recipients, failed))
+        if failed:
+            self.send_json(500, {"StatusId": -3, "StatusDescription": "Stub failure"})
+            return
+        self.send_json(
+            200,
+            {
+                "StatusId": 1,
+                "StatusDescription": "Success",
+                "RequestId": str(uuid.uuid4()),
+                "Data": {"CampaignRefId": data.get("CampaignRefId"), "Recipients": recipients},
+            },
+        )
+
+
+class ApiStubHandler(StubHandler):
+    def respond(self):
+        body = self.read_body()
+        stub = self.server.stub
+        if stub["latency_ms"]:
+            time.sleep(stub["latency_ms"] / 1000)
+        path = urlsplit(self.path).path.rstrip("/")
+        with stub["lock"]:
+            stub["received"].append((time.time(), self.command, path, len(body)))
+        if path.endswith("/login"):
+            self.send_json(200, {"success": True, "data": {"token": "stub-token", "user": {"id": 1}}})
+            return
+        self.send_json(
+            201 if self.command == "POST" else 200,
+            {"success": True, "data": {"id": 1, "path": path, "items": [{"id": index} for index in range(stub["items"])]}},
+        )
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = respond
+
+
+class TLSThreadingHTTPServer(ThreadingHTTPServer):
+    def finish_request(self, request, client_address):
+        try:
+            request = self.ssl_context.wrap_socket(request, server_side=True)
+        except (ssl.SSLError, OSError):
+            return
+        try:
+            super().finish_request(request, client_address)
+        finally:
+            request.close()
+
+
+class CashcowStubHandler(StubHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        stub = self.server.stub
+        if stub["latency_ms"]:
+            time.sleep(stub["latency_ms"] / 1000)
+        try:
+            page = max(int(query.get("page", ["1"])[0]), 1)
+            page_size = max(int(query.get("page_size", ["20"])[0]), 1)
+        except ValueError:
+            self.send_json(400, {"state_id": 1, "result": [], "message": "Invalid paging"})
+            return
+
+        path = url.path.rstrip("/")
+        if path == "/Api/Products/GetQty":
+            total = stub["products"]
+            build = cashcow_product
+        elif path == "/Api/Stores/Orders":
+            total = stub["orders"]
+            build = cashcow_order
+        else:
+            self.send_json(404, {"state_id": 1, "result": [], "message": "Not found"})
+            return
+
+        first = (page - 1) * page_size
+        result = [build(stub, index) for index in range(first, min(first + page_size, total))]
+        with stub["lock"]:
+            stub["received"].append((time.time(), path, len(result)))
+        self.send_json(
+            200,
+            {
+                "token": query.get("token", [""])[0],
+                "response_time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "state_id": 0,
+                "page": page,
+                "page_size": page_size,
+                "total_records": total,
+                "store_id": query.get("store_id", [""])[0],
+                "result": result,
+            },
+        )
+
+    def do_POST(self):
+        body = self.read_body()
+        if self.path.rstrip("/") != "/toyland/inventory":
+            self.send_json(404, {"message": "Not found"})
+            return
+        try:
+            items = json.loads(body)
+        except ValueError:
+            self.send_json(400, {"message": "Invalid JSON"})
+            return
+        with self.server.stub["lock"]:
+            self.server.stub["received"].append((time.time(), "/toyland/inventory", len(items)))
+        self.send_json(200, {"status": "ok", "received": len(items)})
+
+
+def cashcow_sku(stub, index):
+    if index < len(stub["skus"]):
+        return stub["skus"][index]
+    return f"{stub['sku_prefix']}{index:07d}"
+
+
+def cashcow_product(stub, index):
+    sku = cashcow_sku(stub, index)
+    qty = (index * 37 + stub["generation"]) % 120
+    attributes = []
+    if stub["variation_every"] and index % stub["variation_every"] == 0:
+        attributes.append(
+            {
+                "attribute_displayname": "מידה",
+                "options": [
+                    {"sku": f"{sku}-{size}", "qty": (qty + offset) % 40, "option_text": size}
+                    for offset, size in enumerate(("S", "M", "L"))
+                ],
+            }
+        )
+    return {"product_id": 1_000_000 + index, "sku": sku, "qty": qty, "attributes": attributes}
+
+
+def cashcow_order(stub, index):
+    lines = []
+    for line in range(1 + index % 3):
+        product = (index * 7 + line) % max(stub["products"], 1)
+        lines.append(
+            {
+                "customer_product_id": 13_000_000 + index * 3 + line,
+                "Id": 1_000_000 + product,
+                "Total": 149.0,
+                "Qty": 1.0,
+                "Name": f"מוצר בדיקה {product}",
+                "Attributes": None,
+                "Order_Code": "",
+                "discount_price": 0.0,
+                "discount_id": 0,
+                "price_before_discount": 149.0,
+                "cost_price": 106.5,
+                "sku": cashcow_sku(stub, product),
+            }
+        )
+    return {
+        "Id": 9_000_000 + index,
+        "ShipingType": 1,
+        "FirstName": "לקוח",
+        "LastName": f"בדיקה {index}",
+        "Email": f"cashcow{index}@example.com",
+        "Phone": f"05{index % 100_000_000:08d}",
+        "Address": "חיפה",
+        "City": "חיפה",
+        "FloorNumber": "1",
+        "StreetNameAndNumber": "איריס 3",
+        "ApartmentNumber": "1",
+        "ZipCode": "",
+        "OrderStatus": 4,
+        "OrderDate": "2025-12-17T20:59:59.743",
+        "ShipingPrice": 35.0,
+        "TotalPrice": 35.0 + 149.0 * len(lines),
+        "IsSelfDelivery": False,
+        "PaymentOptionType": 14,
+        "TotalProducts": len(lines),
+        "Products": lines,
+        "CuponId": 0,
+        "TransactionId": str(uuid.UUID(int=index)),
+        "LastDigits": "1135",
+        "InvoiceUrl": None,
+        "CopyInvoiceUrl": None,
+        "DiscountId": 0,
+        "DiscountPrice": 0.0,
+        "CustomerInstructions": "",
+    }
+
+
+def self_signed_certificate(directory, host="localhost"):
+    certificate = f"{directory}/stub-cert.pem"
+    key = f"{directory}/stub-key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            f"/CN={host}",
+            "-addext",
+            f"subjectAltName=DNS:{host},DNS:localhost,IP:127.0.0.1",
+            "-keyout",
+            key,
+            "-out",
+            certificate,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certificate, key
+
+
+def start_stub(handler, host="127.0.0.1", port=0, tls=None, **state):
+    if tls:
+        server = TLSThreadingHTTPServer((host, port), handler)
+        server.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server.ssl_context.load_cert_chain(*tls)
+        server.ssl_context.set_alpn_protocols(["http/1.1"])
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.stub = {"lock": threading.Lock(), "received": [], **state}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def start_inforu_stub(host="127.0.0.1", port=0, latency_ms=0.0, failure_rate=0.0):
+    return start_stub(InforuStubHandler, host, port, latency_ms=latency_ms, failure_rate=failure_rate)
+
+
+def start_cashcow_stub(
+    host="127.0.0.1",
+    port=0,
+    products=1_000,
+    orders=0,
+    latency_ms=0.0,
+    sku_prefix="CC-LOAD-",
+    variation_every=5,
+    skus=(),
+):
+    return start_stub(
+        CashcowStubHandler,
+        host,
+        port,
+        products=products,
+        orders=orders,
+        latency_ms=latency_ms,
+        sku_prefix=sku_prefix,
+        variation_every=variation_every,
+        skus=list(skus),
+        generation=0,
+    )
+
+
+def start_api_stub(host="127.0.0.1", port=0, tls=None, latency_ms=0.0, items=10):
+    return start_stub(ApiStubHandler, host, port, tls=tls, latency_ms=latency_ms, items=items)
+
+
+def stub_url(server):
+    host, port = server.server_address[:2]
+    scheme = "https" if isinstance(server, TLSThreadingHTTPServer) else "http"
+    return f"{scheme}://{host}:{port}"
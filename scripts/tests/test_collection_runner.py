@@ -0,0 +1,233 @@
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import unittest
+from argparse import Namespace
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import collection_runner  # noqa: E402
+import stub_servers  # noqa: E402
+
+
+def results(samples, duration_s=10.0):
+    return {
+        "duration_s": duration_s,
+        "items": {
+            "Orders/List orders": {
+                "count": len(samples),
+                "samples": samples,
+                "histogram": {},
+            }
+        },
+    }
+
+
+def compare_args(**overrides):
+    args = {
+        "max_samples": 2000,
+        "min_samples": 30,
+        "min_tail": 10,
+        "threshold": 5.0,
+        "bootstrap": 300,
+        "confidence": 0.95,
+    }
+    args.update(overrides)
+    return Namespace(**args)
+
+
+class PercentileTest(unittest.TestCase):
+    def test_interpolates_between_ranks(self):
+        self.assertEqual(collection_runner.percentile([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(collection_runner.percentile([1, 2, 3, 4], 100), 4)
+        self.assertIsNone(collection_runner.percentile([], 95))
+
+    def test_percentiles_of_matches_percentile(self):
+        samples = sorted(random.Random(3).uniform(1, 100) for _ in range(257))
+        values = collection_runner.percentiles_of(samples, (50, 95, 99))
+        for pct, value in values.items():
+            self.assertEqual(value, collection_runner.percentile(samples, pct))
+
+
+class CompareTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.baseline = [rng.gauss(40, 4) for _ in range(1500)]
+
+    def test_identical_run_passes(self):
+        comparison = collection_runner.compare_item(
+            "Orders/List orders",
+            results(self.baseline),
+            results(list(self.baseline)),
+            compare_args(),
+            random.Random(1),
+        )
+        self.assertEqual(comparison["verdict"], "ok")
+        self.assertEqual(comparison["regressions"], [])
+
+    def test_clear_tail_regression_gates(self):
+        candidate = [value * 1.5 for value in self.baseline]
+        comparison = collection_runner.compare_item(
+            "Orders/List orders",
+            results(self.baseline),
+            results(candidate),
+            compare_args(),
+            random.Random(1),
+        )
+        self.assertEqual(comparison["regressions"], ["p95", "p99"])
+        self.assertTrue(comparison["verdict"].startswith("REGRESSION"))
+
+    def test_sparse_tail_does_not_gate(self):
+        candidate = [value * 1.5 for value in self.baseline[:200]]
+        comparison = collection_runner.compare_item(
+            "Orders/List orders",
+            results(self.baseline[:200]),
+            results(candidate),
+            compare_args(),
+            random.Random(1),
+        )
+        self.assertEqual(comparison["regressions"], ["p95"])
+
+    def test_too_few_samples(self):
+        comparison = collection_runner.compare_item(
+            "Orders/List orders",
+            results(self.baseline[:10]),
+            results(self.baseline[:10]),
+            compare_args(),
+            random.Random(1),
+        )
+        self.assertEqual(comparison["verdict"], "insufficient samples")
+
+    def test_bootstrap_interval_brackets_shift(self):
+        rng = random.Random(2)
+        candidate = [value + 10 for value in self.baseline]
+        intervals = collection_runner.bootstrap_deltas(self.baseline, candidate, (50, 95), 300, 0.95, rng)
+        for lower, upper in intervals.values():
+            self.assertLess(lower, 10.0 + 1e-9)
+            self.assertGreater(upper, 10.0 - 1e-9)
+            self.assertGreater(lower, 0)
+
+
+class CurrentBranchTest(unittest.TestCase):
+    def git_output(self, branch):
+        return mock.patch.object(
+            collection_runner.subprocess, "run", return_value=mock.Mock(stdout=f"{branch}\n")
+        )
+
+    def test_ci_variable_wins_over_detached_head(self):
+        with mock.patch.dict(collection_runner.os.environ, {"GITHUB_HEAD_REF": "feature/x"}, clear=True):
+            with self.git_output("HEAD"):
+                self.assertEqual(collection_runner.current_branch(), "feature/x")
+
+    def test_detached_head_without_ci_variable_is_an_error(self):
+        with mock.patch.dict(collection_runner.os.environ, {}, clear=True):
+            with self.git_output("HEAD"):
+                with self.assertRaises(SystemExit):
+                    collection_runner.current_branch()
+
+    def test_checked_out_branch(self):
+        with mock.patch.dict(collection_runner.os.environ, {}, clear=True):
+            with self.git_output("main"):
+                self.assertEqual(collection_runner.current_branch(), "main")
+
+    def test_default_baselines_are_not_git_ignored(self):
+        ignored = collection_runner.subprocess.run(
+            ["git", "check-ignore", "-q", str(collection_runner.BASELINE_DIRECTORY / "main.json")],
+            cwd=collection_runner.BASELINE_DIRECTORY.parent,
+        )
+        self.assertEqual(ignored.returncode, 1)
+
+
+class ShardTest(unittest.TestCase):
+    items = [{"key": f"Folder/Item {index}", "method": "GET"} for index in range(40)]
+
+    def test_shards_split_users_and_items_exactly(self):
+        for total in range(1, 6):
+            users, items = [], []
+            for index in range(1, total + 1):
+                _, shard_users = collection_runner.shard_plan(self.items, 13, (index, total), "users")
+                shard_items, _ = collection_runner.shard_plan(self.items, 13, (index, total), "items")
+                users.extend(shard_users)
+                items.extend(item["key"] for item in shard_items)
+            self.assertEqual(sorted(users), list(range(13)))
+            self.assertEqual(sorted(items), sorted(item["key"] for item in self.items))
+
+    def user_responses(self, user):
+        rng = random.Random(user)
+        for item in self.items[:5]:
+            for _ in range(20):
+                yield item, {"status": 200, "elapsed_ms": rng.lognormvariate(3, 0.5), "headers": {}}
+
+    def run_users(self, users, shard=(1, 1)):
+        items = {item["key"]: collection_runner.new_item_result(item) for item in self.items[:5]}
+        for user in users:
+            for item, response in self.user_responses(user):
+                collection_runner.record_response(items[item["key"]], response)
+        return collection_runner.build_results("load", items, 100.0, 110.0, shard=shard)
+
+    def test_merged_shards_reproduce_the_unsharded_run(self):
+        unsharded = self.run_users(range(12))
+        shards = [
+            self.run_users(collection_runner.shard_plan(self.items, 12, (index, 3), "users")[1], (index, 3))
+            for index in range(1, 4)
+        ]
+        merged = collection_runner.merge_results(shards)
+        self.assertAlmostEqual(merged["throughput"], unsharded["throughput"])
+        self.assertAlmostEqual(merged["shard_throughput"], unsharded["throughput"])
+        for key, result in unsharded["items"].items():
+            expected = collection_runner.item_summary(result)
+            actual = collection_runner.item_summary(merged["items"][key])
+            self.assertEqual(actual["count"], expected["count"])
+            for pct in collection_runner.PERCENTILES:
+                self.assertAlmostEqual(actual[f"p{pct}"], expected[f"p{pct}"])
+
+    def test_merged_shard_files_match_unsharded_counts(self):
+        server = stub_servers.start_api_stub()
+        self.addCleanup(server.shutdown)
+        base = ["load", "--var", f"base_url={stub_servers.stub_url(server)}", "--users", "5", "--iterations", "2"]
+
+        def run(*extra):
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                collection_runner.main(base + list(extra))
+
+        with tempfile.TemporaryDirectory() as directory:
+            run("--output", f"{directory}/all.json")
+            unsharded = collection_runner.load_results(f"{directory}/all.json")
+            for split in ("users", "items"):
+                paths = [f"{directory}/{split}-{index}.json" for index in range(1, 4)]
+                for index, path in enumerate(paths, 1):
+                    run("--shard", f"{index}/3", "--split", split, "--output", path)
+                merged = collection_runner.merge_results([collection_runner.load_results(path) for path in paths])
+                self.assertEqual([shard["index"] for shard in merged["shards"]], [1, 2, 3])
+                self.assertEqual(
+                    {key: result["count"] for key, result in merged["items"].items()},
+                    {key: result["count"] for key, result in unsharded["items"].items()},
+                )
+
+
+class ServerCostsTest(unittest.TestCase):
+    def test_outside_time_only_uses_responses_with_app_time(self):
+        result = collection_runner.new_item_result({"method": "GET"})
+        for _ in range(10):
+            response = {"status": 200, "elapsed_ms": 500.0, "headers": {"server-timing": "db;dur=5"}}
+            collection_runner.record_response(result, response)
+            response = {"status": 200, "elapsed_ms": 50.0, "headers": {"server-timing": "app;dur=45"}}
+            collection_runner.record_response(result, response)
+
+        (row,) = collection_runner.server_cost_rows({"items": {"Orders/List orders": result}})
+        self.assertEqual(row["responses"], 20)
+        self.assertAlmostEqual(row["app_ms"], 45.0)
+        self.assertAlmostEqual(row["outside_ms"], 5.0)
+        self.assertAlmostEqual(row["outside_share"], 0.1)
+
+    def test_app_time_needs_an_explicit_metric(self):
+        costs = collection_runner.server_costs({"server-timing": "db;dur=1.5, cache;dur=3"})
+        self.assertEqual(costs, {"db_ms": 1.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
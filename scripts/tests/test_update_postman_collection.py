@@ -0,0 +1,136 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import update_postman_collection as generator  # noqa: E402
+
+ROUTES = """<?php
+Route::post('/login', [AuthController::class, 'login']);
+Route::middleware(['auth:sanctum'])->get('/system-settings/shipping', [SystemSettingController::class, 'show']);
+Route::middleware('auth:sanctum')->group(function () {
+    Route::apiResource('discounts', DiscountController::class);
+    Route::get('/orders/{order}/invoice', [OrderController::class, 'invoice']);
+    // Route::get('/legacy', [LegacyController::class, 'index']);
+    /* Route::delete('/orders/{order}', [OrderController::class, 'destroy']); */
+});
+Route::get('/images/{path}', [ImageController::class, 'show'])->where('path', '.*');
+"""
+
+
+def request_item(name, method, *path):
+    return {
+        "name": name,
+        "request": {
+            "method": method,
+            "header": [],
+            "url": {
+                "raw": "/".join(["{{base_url}}", *path]),
+                "host": ["{{base_url}}"],
+                "path": list(path),
+            },
+        },
+    }
+
+
+def collection(*items):
+    return {
+        "info": {"name": "Test", "schema": generator.POSTMAN_SCHEMA},
+        "item": [{"name": "Folder", "item": list(items)}],
+        "variable": [{"key": "base_url", "value": "http://localhost:8000"}, {"key": "discount_id", "value": "1"}],
+    }
+
+
+def errors(issues):
+    return [message for level, _, message in issues if level == "error"]
+
+
+class RouteIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.routes = generator.route_index(ROUTES)
+
+    def exists(self, method, path):
+        return generator.route_exists(self.routes, method, tuple(path.split("/")))
+
+    def test_api_resource_expands_to_crud_routes(self):
+        for method, path in (
+            ("GET", "api/discounts"),
+            ("POST", "api/discounts"),
+            ("GET", "api/discounts/{}"),
+            ("PUT", "api/discounts/{}"),
+            ("PATCH", "api/discounts/{}"),
+            ("DELETE", "api/discounts/{}"),
+        ):
+            self.assertTrue(self.exists(method, path), f"{method} {path}")
+        self.assertFalse(self.exists("POST", "api/discounts/{}"))
+
+    def test_chained_middleware_route(self):
+        self.assertTrue(self.exists("GET", "api/system-settings/shipping"))
+
+    def test_wildcard_parameter_matches_nested_paths(self):
+        self.assertTrue(self.exists("GET", "api/images/products/2024/a.jpg"))
+        self.assertFalse(self.exists("GET", "api/images"))
+        self.assertFalse(self.exists("POST", "api/images/a.jpg"))
+
+    def test_parameters_match_any_segment(self):
+        self.assertTrue(self.exists("GET", "api/orders/42/invoice"))
+
+    def test_commented_routes_are_ignored(self):
+        self.assertFalse(self.exists("GET", "api/legacy"))
+        self.assertFalse(self.exists("DELETE", "api/orders/{}"))
+
+
+class ValidateCollectionTest(unittest.TestCase):
+    def test_known_routes_pass(self):
+        issues, rechecked = generator.validate_collection(
+            collection(
+                request_item("Shipping", "GET", "api", "system-settings", "shipping"),
+                request_item("Update discount", "PUT", "api", "discounts", "{{discount_id}}"),
+                request_item("Image", "GET", "api", "images", "products", "a.jpg"),
+            ),
+            ROUTES,
+        )
+        self.assertEqual(errors(issues), [])
+        self.assertEqual(rechecked, 1)
+
+    def test_missing_route_is_an_error(self):
+        issues, _ = generator.validate_collection(
+            collection(request_item("Legacy", "GET", "api", "legacy")),
+            ROUTES,
+        )
+        self.assertEqual(errors(issues), ["GET /api/legacy has no route in routes/api.php"])
+
+    def test_cache_reuses_unchanged_folders(self):
+        cache = {}
+        folder = collection(request_item("Login", "POST", "api", "login"))
+        generator.validate_collection(folder, ROUTES, cache)
+        _, rechecked = generator.validate_collection(folder, ROUTES, cache)
+        self.assertEqual(rechecked, 0)
+        _, rechecked = generator.validate_collection(folder, ROUTES + "\n", cache)
+        self.assertEqual(rechecked, 1)
+
+    def test_generated_collection_validates(self):
+        issues, _ = generator.validate_collection(generator.build_collection())
+        self.assertEqual(errors(issues), [])
+
+
+class CarryOverTest(unittest.TestCase):
+    def test_hand_made_items_and_variables_survive_regeneration(self):
+        existing = generator.build_collection()
+        orders = next(folder for folder in existing["item"] if folder["name"] == "Orders")
+        orders["item"].insert(1, request_item("Hand made", "GET", "api", "orders"))
+        existing["item"].append(request_item("Top level", "GET", "api", "orders"))
+        existing["variable"].append({"key": "hand_variable", "value": "1"})
+
+        merged = generator.carry_over(generator.build_collection(), existing)
+        self.assertEqual(merged, existing)
+
+    def test_checked_in_collection_is_generated(self):
+        with generator.COLLECTION_PATH.open(encoding="utf-8") as f:
+            self.assertEqual(generator.build_collection(), json.load(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,10 @@
+import argparse
+import hashlib
 import json
+import os
+import re
+import sys
+import time
 from pathlib import Path
 
 
@@ -37,6 +43,35 @@ SAMPLE_BANK_DETAILS = {
     "account_number": "456789",
     "account_name": "Merchant LTD",
 }
+ROOT_PATH = Path(__file__).resolve().parent.parent
+COLLECTION_PATH = ROOT_PATH / "KFitz_API_Collection.json"
+ROUTES_PATH = ROOT_PATH / "routes" / "api.php"
+ROUTE_DEFINITION_PATTERN = re.compile(
+    r"Route::(?:\w+\((?:[^()]|\([^()]*\))*\)\s*->\s*)*"
+    r"(?:(get|post|put|patch|delete)\(\s*'([^']*)'|apiResource\(\s*'([^']*)')"
+)
+PHP_COMMENT_PATTERN = re.compile(r"('(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\")|/\*.*?\*/|//[^\n]*|#[^\n]*", re.S)
+WILDCARD_PARAMETER_PATTERN = re.compile(r"->where\(\s*'(\w+)'\s*,\s*'\.\*'\s*\)")
+ROUTE_PARAMETER_PATTERN = re.compile(r"\{\w+\??\}")
+VARIABLE_SEGMENT_PATTERN = re.compile(r"\{\{[^{}]+\}\}|:\w+")
+VARIABLE_REFERENCE_PATTERN = re.compile(r"\{\{\s*([^{}\s]+)\s*\}\}")
+SCRIPT_VARIABLE_PATTERN = re.compile(
+    r"pm\.(?:collectionVariables|environment|variables|globals)\.(set|get|unset)\(\s*['\"]([^'\"]+)['\"]"
+)
+POSTMAN_SCHEMA = "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+HTTP_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+BODY_MODES = {"raw", "urlencoded", "formdata", "file", "graphql"}
+VALIDATION_CACHE_PATH = ROOT_PATH / "storage" / "framework" / "cache" / "postman-validation.json"
+VALIDATOR_DIGEST = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+JSON_HEADERS = [
+    {"key": "Content-Type", "value": "application/json"},
+    {"key": "Accept", "value": "application/json"},
+]
+ORDER_ITEMS = [
+    {"product_id": "{{product_id}}", "variation_id": "{{product_variation_id}}", "quantity": 1},
+    {"product_id": "{{secondary_product_id}}", "variation_id": "{{secondary_product_variation_id}}", "quantity": 2},
+]
+MISSING_VARIATION_ITEMS = [{"product_id": "{{variant_product_id}}", "quantity": 1}]
 PLUGIN_CUSTOMER_ADDRESS = {
     "line1": "תובל 32",
     "city": "רמת גן",
@@ -46,9 +81,30 @@ PLUGIN_CUSTOMER_ADDRESS = {
 }
 
 
+def expect_missing_variation_test(label, subject):
+    return {
+        "listen": "test",
+        "script": {
+            "type": "text/javascript",
+            "exec": [
+                f"pm.test('Returns 422 when {label} missing', function () {{",
+                "    pm.response.to.have.status(422);",
+                "});",
+                "const body = pm.response.json();",
+                "const message = (body && body.message ? body.message : '').toLowerCase();",
+                f"pm.test('{subject} variation', function () {{",
+                "    pm.expect(message).to.include('variation');",
+                "});",
+            ],
+        },
+    }
+
+
 def build_url(path_segments, query=None):
     raw_path = "/".join(path_segments)
     raw_url = f"{BASE_URL_VARIABLE}/{raw_path}" if raw_path else BASE_URL_VARIABLE
+    if query:
+        raw_url += "?" + "&".join(f"{entry['key']}={entry['value']}" for entry in query)
     url = {
         "raw": raw_url,
         "host": [BASE_URL_VARIABLE],
@@ -360,6 +416,22 @@ def public_catalog_folder():
             "Get product",
             "GET",
             ["api", "products", "{{product_id}}"],
+            tests={
+                "listen": "test",
+                "script": {
+                    "type": "text/javascript",
+                    "exec": [
+                        "const json = pm.response.json();",
+                        "pm.test('Response contains product data', function () {",
+                        "    pm.expect(json).to.have.property('data');",
+                        "});",
+                        "const product = json.data || {};",
+                        "pm.test('Product includes variations snapshot', function () {",
+                        "    pm.expect(product).to.have.property('variations');",
+                        "});",
+                    ],
+                },
+            },
         ),
         create_request(
             "Low stock products",
@@ -429,23 +501,66 @@ def orders_folder():
                     "shipping_cost": 29.9,
                     "billing_address": SAMPLE_BILLING_ADDRESS,
                     "shipping_address": SAMPLE_SHIPPING_ADDRESS,
-                    "items": [
-                        {
-                            "product_id": "{{product_id}}",
-                            "quantity": 1,
-                            "unit_price": 199.9,
-                            "discount": 0,
-                        },
-                        {
-                            "product_id": "{{secondary_product_id}}",
-                            "quantity": 2,
-                            "unit_price": 79.9,
-                        }
-                    ],
+                    "items": ORDER_ITEMS,
                     "notes": "הזמנת בדיקה מפוסטמן",
                 }
             ),
         ),
+        create_request(
+            "Create order (delivery)",
+            "POST",
+            ["api", "orders"],
+            body=raw_body(
+                {
+                    "merchant_id": "{{merchant_id}}",
+                    "merchant_customer_id": "{{merchant_customer_id}}",
+                    "shipping_type": "delivery",
+                    "shipping_method": "regular",
+                    "shipping_cost": 29.9,
+                    "billing_address": SAMPLE_BILLING_ADDRESS,
+                    "shipping_address": SAMPLE_SHIPPING_ADDRESS,
+                    "items": ORDER_ITEMS[:1],
+                    "notes": "הזמנת משלוח לבדיקה",
+                }
+            ),
+        ),
+        create_request(
+            "Create order (pickup)",
+            "POST",
+            ["api", "orders"],
+            body=raw_body(
+                {
+                    "merchant_id": "{{merchant_id}}",
+                    "merchant_customer_id": "{{merchant_customer_id}}",
+                    "shipping_type": "pickup",
+                    "shipping_method": "pickup",
+                    "shipping_cost": 0,
+                    "billing_address": SAMPLE_BILLING_ADDRESS,
+                    "shipping_address": dict(SAMPLE_BILLING_ADDRESS, notes="איסוף עצמי"),
+                    "items": ORDER_ITEMS[:1],
+                    "notes": "הזמנת איסוף עצמי לבדיקה",
+                }
+            ),
+        ),
+        create_request(
+            "Create order (missing variation - expect 422)",
+            "POST",
+            ["api", "orders"],
+            body=raw_body(
+                {
+                    "merchant_id": "{{merchant_id}}",
+                    "merchant_customer_id": "{{merchant_customer_id}}",
+                    "shipping_type": "delivery",
+                    "shipping_method": "regular",
+                    "shipping_cost": 29.9,
+                    "billing_address": SAMPLE_BILLING_ADDRESS,
+                    "shipping_address": {key: value for key, value in SAMPLE_SHIPPING_ADDRESS.items() if key != "notes"},
+                    "items": MISSING_VARIATION_ITEMS,
+                    "notes": "בדיקה: מוצר עם וריאציות ללא variation_id",
+                }
+            ),
+            tests=expect_missing_variation_test("variation", "Error message mentions"),
+        ),
         create_request(
             "Get order",
             "GET",
@@ -532,6 +647,12 @@ def orders_folder():
                 }
             ),
         ),
+        create_request(
+            "Sync Cashcow orders",
+            "POST",
+            ["api", "cashcow", "orders", "sync"],
+            body=raw_body({"page": 1, "page_size": 50}),
+        ),
     ]
     return {"name": "Orders", "item": items}
 
@@ -546,13 +667,19 @@ def shipments_folder():
             body=raw_body(
                 {
                     "order_id": "{{order_id}}",
+                    "carrier": "chita",
                     "carrier_id": "{{shipping_carrier_id}}",
-                    "tracking_number": "TRACK12345",
-                    "status": "pending",
+                    "tracking_number": "{{tracking_number}}",
+                    "service_type": "regular",
+                    "package_type": "regular",
                     "weight": 2.6,
                     "length": 30,
                     "width": 20,
                     "height": 15,
+                    "origin_address": SAMPLE_ADDRESS,
+                    "destination_address": SAMPLE_SHIPPING_ADDRESS,
+                    "shipping_cost": 29.9,
+                    "cod_payment": False,
                     "notes": "משלוח בדיקה - חולצות בייבי",
                 }
             ),
@@ -576,13 +703,18 @@ def shipments_folder():
             ["api", "shipments", "{{shipment_id}}", "tracking-events"],
             body=raw_body(
                 {
-                    "status": "in_transit",
+                    "event": "in_transit",
+                    "description": "המשלוח מוין ונשלח להפצה",
                     "location": "מרכז לוגיסטי, תל אביב",
-                    "details": "המשלוח מוין ונשלח להפצה",
-                    "occurred_at": "2024-11-01T10:30:00+02:00",
                 }
             ),
         ),
+        create_request(
+            "Update COD collection status",
+            "POST",
+            ["api", "shipments", "cod-collection", "status"],
+            body=raw_body({"shipment_ids": ["{{shipment_id}}"], "collected": True}),
+        ),
     ]
     return {"name": "Shipments", "item": items}
 
@@ -617,6 +749,28 @@ def merchant_folder():
             "GET",
             ["api", "merchant", "customers"],
         ),
+        create_request(
+            "Import merchant customers",
+            "POST",
+            ["api", "merchant", "customers", "import"],
+            headers=[{"key": "Content-Type", "value": "multipart/form-data"}],
+            body=form_data_body(
+                [
+                    {
+                        "key": "file",
+                        "type": "file",
+                        "src": ["/absolute/path/to/customers.csv"],
+                    },
+                    {
+                        "key": "merchant_user_id",
+                        "value": "{{merchant_id}}",
+                        "type": "text",
+                        "description": "Required when importing as admin.",
+                    },
+                ]
+            ),
+            description="Update the file path before sending. CSV headers: name, phone, email, notes, street, city, zip, country.",
+        ),
         create_request(
             "Get merchant customer",
             "GET",
@@ -639,15 +793,13 @@ def merchant_folder():
             "Plugin order (merchant portal)",
             "POST",
             ["api", "plugin", "orders"],
+            headers=JSON_HEADERS,
             body=raw_body(
                 {
                     "site_url": "{{plugin_site_url}}",
                     "order_number": "PLUGIN-{{plugin_order_number}}",
                     "total": 399.7,
-                    "items": [
-                        {"product_id": "{{product_id}}", "quantity": 1},
-                        {"product_id": "{{secondary_product_id}}", "quantity": 2},
-                    ],
+                    "items": ORDER_ITEMS,
                     "customer": {
                         "name": "נועם הלקוח",
                         "email": SAMPLE_EMAIL,
@@ -665,6 +817,33 @@ def merchant_folder():
                 }
             ),
         ),
+        create_request(
+            "Plugin order (missing variation - expect 422)",
+            "POST",
+            ["api", "plugin", "orders"],
+            headers=JSON_HEADERS,
+            body=raw_body(
+                {
+                    "site_url": "{{plugin_site_url}}",
+                    "order_number": "MISSING-VAR-{{plugin_order_number}}",
+                    "total": 199.9,
+                    "items": MISSING_VARIATION_ITEMS,
+                    "customer": {
+                        "name": "מבחן פלאגין",
+                        "email": SAMPLE_EMAIL,
+                        "phone": SAMPLE_PHONE,
+                        "address": {
+                            "line1": "תובל 12",
+                            "city": "תל אביב",
+                            "state": "מחוז תל אביב",
+                            "zip": "12345",
+                            "country": "IL",
+                        },
+                    },
+                }
+            ),
+            tests=expect_missing_variation_test("plugin variation", "Error mentions"),
+        ),
     ]
     return {"name": "Merchant", "item": items}
 
@@ -791,6 +970,7 @@ def admin_products_items():
             ),
             description="Update the file path before sending.",
         ),
+        create_request("Sync Cashcow Inventory", "POST", ["api", "admin", "products", "sync-inventory"]),
     ]
 
 
@@ -890,11 +1070,17 @@ def admin_shipping_items():
 
 def admin_plugin_sites_items():
     return [
-        create_request("List plugin sites", "GET", ["api", "plugin-sites"]),
+        create_request(
+            "List plugin sites",
+            "GET",
+            ["api", "plugin-sites"],
+            headers=[{"key": "Accept", "value": "application/json"}],
+        ),
         create_request(
             "Create plugin site",
             "POST",
             ["api", "plugin-sites"],
+            headers=JSON_HEADERS,
             body=raw_body(
                 {
                     "name": "Shopify Store",
@@ -910,6 +1096,252 @@ def admin_plugin_sites_items():
     ]
 
 
+def admin_email_items():
+    return [
+        create_request("List email templates", "GET", ["api", "email", "templates"]),
+        create_request(
+            "Send template test",
+            "POST",
+            ["api", "email", "templates", "{{email_template_id}}", "send-test"],
+            body=raw_body(
+                {
+                    "recipients": {"to": [SAMPLE_EMAIL], "cc": [], "bcc": []},
+                    "payload": {"order": {"order_number": "ORD-1001"}},
+                }
+            ),
+        ),
+        create_request("List email lists", "GET", ["api", "email", "lists"]),
+        create_request(
+            "Create email list",
+            "POST",
+            ["api", "email", "lists"],
+            body=raw_body(
+                {
+                    "name": "לקוחות VIP",
+                    "description": "רשימת תפוצה לבדיקה",
+                }
+            ),
+        ),
+        create_request("Get email list", "GET", ["api", "email", "lists", "{{email_list_id}}"]),
+        create_request(
+            "Add email list contacts",
+            "POST",
+            ["api", "email", "lists", "{{email_list_id}}", "contacts"],
+            body=raw_body(
+                {
+                    "contacts": [
+                        {"type": "manual", "name": "רות כהן", "email": SAMPLE_EMAIL, "phone": SAMPLE_PHONE},
+                        {"type": "merchant", "reference_id": "{{merchant_id}}"},
+                    ]
+                }
+            ),
+        ),
+        create_request(
+            "Remove email list contact",
+            "DELETE",
+            ["api", "email", "lists", "{{email_list_id}}", "contacts", "{{email_list_contact_id}}"],
+        ),
+        create_request(
+            "Broadcast email",
+            "POST",
+            ["api", "email", "broadcast"],
+            body=raw_body(
+                {
+                    "subject": "עדכון מהחנות",
+                    "body": "שלום, יש לנו מבצעים חדשים בחנות!",
+                    "merchant_ids": ["{{merchant_id}}"],
+                    "customer_ids": ["{{merchant_customer_id}}"],
+                    "emails": [SAMPLE_EMAIL],
+                }
+            ),
+        ),
+        create_request(
+            "Email logs",
+            "GET",
+            ["api", "email", "logs"],
+            query=[{"key": "event_key", "value": "broadcast.manual"}, {"key": "per_page", "value": "20"}],
+        ),
+        create_request("Get email log", "GET", ["api", "email", "logs", "{{email_log_id}}"]),
+    ]
+
+
+def plugin_integrations_folder():
+    plugin_query = [{"key": "site_url", "value": "{{plugin_site_url}}"}]
+    catalog_query = plugin_query + [{"key": "category_id", "value": "{{plugin_category_id}}"}]
+    accept_header = [{"key": "Accept", "value": "application/json"}]
+    items = [
+        create_request(
+            "Plugin Login (merchant credentials)",
+            "POST",
+            ["api", "login"],
+            body=raw_body(
+                {
+                    "email": "{{merchant_email}}",
+                    "password": "{{merchant_password}}",
+                }
+            ),
+            tests=[login_test_script("merchant")],
+        ),
+        create_request("Plugin Verify Session (/api/me)", "GET", ["api", "me"]),
+        create_request(
+            "Plugin Site - Create",
+            "POST",
+            ["api", "plugin-sites"],
+            headers=[{"key": "Content-Type", "value": "application/json"}] + accept_header,
+            body=raw_body(
+                {
+                    "site_url": "{{plugin_site_url}}",
+                    "name": "Default FB Shop",
+                    "platform": "wordpress",
+                    "contact_name": "Marketplace Admin",
+                    "contact_phone": "+972520000000",
+                }
+            ),
+        ),
+        create_request(
+            "Plugin Categories - List",
+            "GET",
+            ["api", "plugin", "categories"],
+            headers=accept_header,
+            query=plugin_query + [{"key": "with_products_only", "value": "true"}],
+        ),
+        create_request(
+            "Plugin Categories - Show",
+            "GET",
+            ["api", "plugin", "categories", "{{plugin_category_id}}"],
+            headers=accept_header,
+            query=plugin_query,
+        ),
+        create_request(
+            "Plugin Products - List",
+            "GET",
+            ["api", "plugin", "products"],
+            headers=accept_header,
+            query=catalog_query + [{"key": "per_page", "value": "50"}],
+        ),
+        create_request(
+            "Plugin Products - Show",
+            "GET",
+            ["api", "plugin", "products", "{{product_id}}"],
+            headers=accept_header,
+            query=catalog_query,
+        ),
+        create_request(
+            "Plugin Products - Inventory Snapshot",
+            "GET",
+            ["api", "plugin", "products", "inventory"],
+            headers=accept_header,
+            query=catalog_query,
+        ),
+        create_request(
+            "Plugin Products - Single Inventory",
+            "GET",
+            ["api", "plugin", "products", "{{product_id}}", "inventory"],
+            headers=accept_header,
+            query=catalog_query,
+        ),
+        create_request(
+            "Plugin Order - Create",
+            "POST",
+            ["api", "plugin", "orders"],
+            headers=[{"key": "Content-Type", "value": "application/json"}] + accept_header,
+            body=raw_body(
+                {
+                    "site_url": "{{plugin_site_url}}",
+                    "external_id": "WP-ORDER-{{plugin_order_number}}",
+                    "customer": {
+                        "name": "WordPress Buyer",
+                        "phone": "+972501234567",
+                        "email": "buyer@example.com",
+                        "address": {
+                            "line1": "Herzl 5",
+                            "city": "Tel Aviv",
+                            "zip": "61000",
+                            "country": "IL",
+                        },
+                    },
+                    "items": [
+                        {
+                            "product_id": "{{product_id}}",
+                            "variation_id": "{{product_variation_id}}",
+                            "quantity": 1,
+                        }
+                    ],
+                    "totals": {
+                        "subtotal": 199.9,
+                        "tax": 34.0,
+                        "shipping_cost": 20,
+                        "discount": 0,
+                        "total": 253.9,
+                    },
+                    "shipping": {"method": "delivery", "type": "regular", "cost": 20},
+                    "notes": "Imported from plugin demo",
+                }
+            ),
+        ),
+    ]
+    return {
+        "name": "Plugin Integrations",
+        "description": "Helpers for plugin store integrations: authentication, plugin site creation, product sync and order import.",
+        "item": items,
+    }
+
+
+def cardcom_notify_item():
+    return create_request(
+        "Payments / Cardcom Notify",
+        "POST",
+        ["api", "payments", "cardcom", "notify"],
+        headers=[{"key": "Content-Type", "value": "application/x-www-form-urlencoded"}],
+        body={
+            "mode": "urlencoded",
+            "urlencoded": [
+                {"key": "responsecode", "value": "0", "type": "text"},
+                {
+                    "key": "ReturnData",
+                    "value": '{"merchantId":1,"month":"2025-12","amount":100}',
+                    "type": "text",
+                    "description": 'Plain JSON: {"merchantId":1,"month":"2025-12","amount":100}',
+                },
+                {"key": "internaldealnumber", "value": "232990567", "type": "text"},
+                {"key": "ApprovelNumber", "value": "049108", "type": "text"},
+                {"key": "UserEmail", "value": "test@example.com", "type": "text"},
+            ],
+        },
+        description="Simulate Cardcom notify callback. Expects ReturnData (base64 JSON with merchantId, month YYYY-MM, amount).",
+    )
+
+
+def admin_folder():
+    return {
+        "name": "Admin",
+        "item": [
+            {"name": "Dashboard", "item": admin_dashboard_items()},
+            {"name": "Users", "item": admin_users_items()},
+            {"name": "Categories", "item": admin_categories_items()},
+            {"name": "Products", "item": admin_products_items()},
+            {"name": "Merchants", "item": admin_merchants_items()},
+            {"name": "Shipping", "item": admin_shipping_items()},
+            {"name": "Plugin Sites", "item": admin_plugin_sites_items()},
+            {"name": "Email", "item": admin_email_items()},
+        ],
+    }
+
+
+FOLDER_BUILDERS = [
+    authentication_folder,
+    email_verification_folder,
+    public_catalog_folder,
+    public_shipping_folder,
+    orders_folder,
+    shipments_folder,
+    merchant_folder,
+    admin_folder,
+    plugin_integrations_folder,
+    cardcom_notify_item,
+]
+
+
 def build_collection():
     collection = {
         "info": {
@@ -928,27 +1360,7 @@ def build_collection():
                 }
             ],
         },
-        "item": [
-            authentication_folder(),
-            email_verification_folder(),
-            public_catalog_folder(),
-            public_shipping_folder(),
-            orders_folder(),
-            shipments_folder(),
-            merchant_folder(),
-            {
-                "name": "Admin",
-                "item": [
-                    {"name": "Dashboard", "item": admin_dashboard_items()},
-                    {"name": "Users", "item": admin_users_items()},
-                    {"name": "Categories", "item": admin_categories_items()},
-                    {"name": "Products", "item": admin_products_items()},
-                    {"name": "Merchants", "item": admin_merchants_items()},
-                    {"name": "Shipping", "item": admin_shipping_items()},
-                    {"name": "Plugin Sites", "item": admin_plugin_sites_items()},
-                ],
-            },
-        ],
+        "item": [builder() for builder in FOLDER_BUILDERS],
         "variable": [
             {"key": "base_url", "value": "http://localhost:8000", "type": "string"},
             {"key": "auth_token", "value": "", "type": "string"},
@@ -971,6 +1383,9 @@ def build_collection():
             {"key": "category_id", "value": "1", "type": "string"},
             {"key": "product_id", "value": "1", "type": "string"},
             {"key": "secondary_product_id", "value": "2", "type": "string"},
+            {"key": "product_variation_id", "value": "1", "type": "string"},
+            {"key": "secondary_product_variation_id", "value": "2", "type": "string"},
+            {"key": "variant_product_id", "value": "1", "type": "string"},
             {"key": "order_id", "value": "1", "type": "string"},
             {"key": "order_status", "value": "pending", "type": "string"},
             {"key": "shipment_id", "value": "1", "type": "string"},
@@ -982,23 +1397,412 @@ def build_collection():
             {"key": "plugin_site_id", "value": "1", "type": "string"},
             {"key": "plugin_site_url", "value": "https://business.facebook.com", "type": "string"},
             {"key": "plugin_site_url2", "value": "https://facebook.com", "type": "string"},
+            {"key": "plugin_category_id", "value": "1", "type": "string"},
             {"key": "plugin_order_number", "value": "TEST-1001", "type": "string"},
             {"key": "tracking_number", "value": "TRACK12345", "type": "string"},
             {"key": "verification_hash", "value": "hash", "type": "string"},
             {"key": "image_path", "value": "products/sample.jpg", "type": "string"},
             {"key": "last_user_id", "value": "", "type": "string"},
+            {"key": "email_template_id", "value": "1", "type": "string"},
+            {"key": "email_list_id", "value": "1", "type": "string"},
+            {"key": "email_list_contact_id", "value": "1", "type": "string"},
+            {"key": "email_log_id", "value": "1", "type": "string"},
         ],
     }
     return collection
 
 
-def main():
-    collection = build_collection()
-    target_path = Path(__file__).resolve().parent.parent / "KFitz_API_Collection.json"
-    with target_path.open("w", encoding="utf-8") as f:
-        json.dump(collection, f, indent=2)
+def write_collection(collection, target_path=COLLECTION_PATH):
+    with Path(target_path).open("w", encoding="utf-8") as f:
+        json.dump(collection, f, indent=2, ensure_ascii=False)
         f.write("\n")
 
 
+def strip_php_comments(text):
+    return PHP_COMMENT_PATTERN.sub(lambda match: match.group(1) or "", text)
+
+
+def route_index(text):
+    text = strip_php_comments(text)
+    exact = set()
+    shapes = {}
+    wildcards = []
+    for match in ROUTE_DEFINITION_PATTERN.finditer(text):
+        if match.group(1):
+            methods = [match.group(1).upper()]
+            templates = [match.group(2)]
+        else:
+            name = match.group(3).strip("/")
+            methods = ["GET", "POST", "GET", "PUT", "PATCH", "DELETE"]
+            templates = [name, name, f"{name}/{{id}}", f"{name}/{{id}}", f"{name}/{{id}}", f"{name}/{{id}}"]
+        statement = text[match.start() : text.find(";", match.end())]
+        catch_all = set(WILDCARD_PARAMETER_PATTERN.findall(statement))
+        for method, template in zip(methods, templates):
+            segments = ["api", *(segment for segment in template.strip("/").split("/") if segment)]
+            if segments[-1].strip("{}?") in catch_all:
+                wildcards.append((method, tuple(normalize_segment(segment) for segment in segments[:-1])))
+                continue
+            normalized = tuple(normalize_segment(segment) for segment in segments)
+            exact.add((method, normalized))
+            shapes.setdefault((method, len(normalized)), []).append(normalized)
+    return {"exact": exact, "shapes": shapes, "wildcards": wildcards}
+
+
+def normalize_segment(segment):
+    if ROUTE_PARAMETER_PATTERN.fullmatch(segment) or VARIABLE_SEGMENT_PATTERN.fullmatch(segment):
+        return "{}"
+    return segment
+
+
+def route_exists(routes, method, segments):
+    if (method, segments) in routes["exact"]:
+        return True
+    for template in routes["shapes"].get((method, len(segments)), []):
+        if all(part == "{}" or part == segment for part, segment in zip(template, segments)):
+            return True
+    for wildcard_method, prefix in routes["wildcards"]:
+        if wildcard_method == method and len(segments) > len(prefix):
+            if all(part == "{}" or part == segment for part, segment in zip(prefix, segments)):
+                return True
+    return False
+
+
+def collect_references(value, where, used):
+    for name in VARIABLE_REFERENCE_PATTERN.findall(json.dumps(value, ensure_ascii=False)):
+        if not name.startswith("$"):
+            used.setdefault(name, where)
+
+
+def collect_script_variables(events, where, used, assigned):
+    for event in events or []:
+        script = (event or {}).get("script") or {}
+        lines = script.get("exec") or []
+        for action, name in SCRIPT_VARIABLE_PATTERN.findall("\n".join(lines) if isinstance(lines, list) else str(lines)):
+            if action == "set":
+                assigned.add(name)
+            else:
+                used.setdefault(name, where)
+
+
+def validate_request(request, where, routes, issues):
+    if isinstance(request, str):
+        request = {"method": "GET", "url": request}
+    if not isinstance(request, dict):
+        issues.append(("error", where, "request must be an object or URL string"))
+        return
+    method = request.get("method", "GET")
+    if method not in HTTP_METHODS:
+        issues.append(("error", where, f"unknown method {method!r}"))
+    for header in request.get("header") or []:
+        if not isinstance(header, dict) or "key" not in header or "value" not in header:
+            issues.append(("error", where, "header entries need key and value"))
+
+    body = request.get("body")
+    if body is not None:
+        mode = body.get("mode") if isinstance(body, dict) else None
+        if mode not in BODY_MODES:
+            issues.append(("error", where, f"unknown body mode {mode!r}"))
+        elif mode in ("urlencoded", "formdata") and not isinstance(body.get(mode), list):
+            issues.append(("error", where, f"body.{mode} must be a list"))
+        elif mode == "raw" and not isinstance(body.get("raw"), str):
+            issues.append(("error", where, "body.raw must be a string"))
+
+    url = request.get("url")
+    if isinstance(url, str):
+        url = {"raw": url}
+    if not isinstance(url, dict) or not isinstance(url.get("raw"), str):
+        issues.append(("error", where, "url.raw is missing"))
+        return
+    raw_path = url["raw"].split("?", 1)[0].split("#", 1)[0]
+    host = url.get("host")
+    path = url.get("path")
+    if path is None:
+        host_part, _, path_part = raw_path.partition("/")
+        host = [host_part]
+        path = path_part.split("/")
+    elif not isinstance(path, list) or not isinstance(host, list):
+        issues.append(("error", where, "url.host and url.path must be lists"))
+        return
+    elif raw_path.rstrip("/") != "/".join([".".join(host), *path]).rstrip("/"):
+        issues.append(("error", where, "url.raw does not match url.host and url.path"))
+    for parameter in url.get("query") or []:
+        if not isinstance(parameter, dict) or "key" not in parameter:
+            issues.append(("error", where, "query entries need a key"))
+
+    if host == [BASE_URL_VARIABLE]:
+        segments = tuple(normalize_segment(str(segment)) for segment in path if segment != "")
+        if not route_exists(routes, method, segments):
+            issues.append(("error", where, f"{method} /{'/'.join(map(str, path))} has no route in routes/api.php"))
+
+
+def validate_entries(entries, trail, routes, state):
+    if not isinstance(entries, list):
+        state["issues"].append(("error", "/".join(trail) or "collection", "item must be a list"))
+        return
+    names = set()
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+            state["issues"].append(("error", "/".join(trail) or "collection", "items need a name"))
+            continue
+        where = "/".join([*trail, entry["name"]])
+        if entry["name"] in names:
+            state["issues"].append(("warning", where, "duplicate name in folder"))
+        names.add(entry["name"])
+        collect_script_variables(entry.get("event"), where, state["used"], state["assigned"])
+        if "item" in entry:
+            collect_references(entry.get("auth"), where, state["used"])
+            validate_entries(entry["item"], [*trail, entry["name"]], routes, state)
+        elif "request" in entry:
+            collect_references(entry["request"], where, state["used"])
+            validate_request(entry["request"], where, routes, state["issues"])
+        else:
+            state["issues"].append(("error", where, "entry has neither item nor request"))
+
+
+def load_validation_cache(path=VALIDATION_CACHE_PATH):
+    try:
+        with Path(path).open(encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_validation_cache(cache, path=VALIDATION_CACHE_PATH):
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+def validate_collection(collection, routes_text=None, cache=None):
+    if routes_text is None:
+        routes_text = ROUTES_PATH.read_text(encoding="utf-8")
+    cache = {} if cache is None else cache
+    routes_digest = hashlib.sha1((VALIDATOR_DIGEST + routes_text).encode("utf-8")).hexdigest()
+    routes = None
+    issues = []
+    used = {}
+    assigned = set()
+
+    info = collection.get("info") if isinstance(collection, dict) else None
+    if not isinstance(info, dict) or not info.get("name"):
+        issues.append(("error", "collection", "info.name is missing"))
+    elif info.get("schema") != POSTMAN_SCHEMA:
+        issues.append(("error", "collection", "info.schema is not Postman v2.1.0"))
+    collect_references(collection.get("auth"), "collection auth", used)
+    collect_script_variables(collection.get("event"), "collection", used, assigned)
+
+    folders = collection.get("item")
+    if not isinstance(folders, list):
+        issues.append(("error", "collection", "item must be a list"))
+        folders = []
+    digests = []
+    rechecked = 0
+    for folder in folders:
+        digest = hashlib.sha1(
+            (routes_digest + json.dumps(folder, sort_keys=True, ensure_ascii=False)).encode("utf-8")
+        ).hexdigest()
+        digests.append(digest)
+        if digest not in cache:
+            if routes is None:
+                routes = route_index(routes_text)
+            state = {"issues": [], "used": {}, "assigned": set()}
+            validate_entries([folder], [], routes, state)
+            cache[digest] = {
+                "issues": state["issues"],
+                "used": state["used"],
+                "assigned": sorted(state["assigned"]),
+            }
+            rechecked += 1
+        cached = cache[digest]
+        issues.extend(tuple(issue) for issue in cached["issues"])
+        for name, where in cached["used"].items():
+            used.setdefault(name, where)
+        assigned.update(cached["assigned"])
+    for digest in set(cache) - set(digests):
+        del cache[digest]
+
+    declared = set()
+    for variable in collection.get("variable") or []:
+        key = variable.get("key") if isinstance(variable, dict) else None
+        if not key:
+            issues.append(("error", "variable", "variables need a key"))
+        elif key in declared:
+            issues.append(("warning", f"variable {key}", "declared more than once"))
+        declared.add(key)
+    for name, where in sorted(used.items()):
+        if name not in declared and name not in assigned:
+            issues.append(("error", where, f"{{{{{name}}}}} is not a declared variable"))
+    for name in sorted(declared - used.keys() - assigned):
+        issues.append(("warning", f"variable {name}", "declared but never used"))
+    return issues, rechecked
+
+
+def report_validation(issues, rechecked, total, elapsed_ms, show_warnings=True):
+    errors = [issue for issue in issues if issue[0] == "error"]
+    for level, where, message in issues:
+        if level == "error" or show_warnings:
+            print(f"{level}: {where}: {message}", file=sys.stderr)
+    print(
+        f"Validated {total} folders ({rechecked} rechecked) in {elapsed_ms:.1f} ms: "
+        f"{len(errors)} errors, {len(issues) - len(errors)} warnings",
+        file=sys.stderr,
+    )
+    return not errors
+
+
+def watched_files():
+    return [ROUTES_PATH, Path(__file__).resolve()]
+
+
+def snapshot(paths):
+    state = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def timed_validation(collection, cache, show_warnings=False):
+    started = time.perf_counter()
+    issues, rechecked = validate_collection(collection, cache=cache)
+    elapsed = (time.perf_counter() - started) * 1000
+    return report_validation(issues, rechecked, len(collection.get("item") or []), elapsed, show_warnings)
+
+
+def carry_over_items(generated, existing):
+    by_name = {entry.get("name"): entry for entry in generated if isinstance(entry, dict)}
+    position = 0
+    for entry in existing or []:
+        if not isinstance(entry, dict):
+            continue
+        match = by_name.get(entry.get("name"))
+        if match is None:
+            generated.insert(position, entry)
+            match = entry
+        elif "item" in entry and "item" in match:
+            carry_over_items(match["item"], entry["item"])
+        position = next(index for index, candidate in enumerate(generated) if candidate is match) + 1
+    return generated
+
+
+def carry_over(collection, existing):
+    if not isinstance(existing, dict):
+        return collection
+    carry_over_items(collection["item"], existing.get("item"))
+    keys = {variable["key"] for variable in collection["variable"]}
+    collection["variable"].extend(
+        variable
+        for variable in existing.get("variable") or []
+        if isinstance(variable, dict) and variable.get("key") not in keys
+    )
+    return collection
+
+
+def load_collection(target_path):
+    try:
+        with Path(target_path).open(encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def regenerate(target_path, cache, validate=True):
+    existing = load_collection(target_path)
+    collection = carry_over(build_collection(), existing)
+    if validate and not timed_validation(collection, cache):
+        return None
+    if collection != existing:
+        write_collection(collection, target_path)
+    return collection != existing
+
+
+def watch(target_path, interval, debounce, validate=True):
+    cache = {}
+    if regenerate(target_path, cache, validate) is None:
+        print("Validation failed, keeping the previous collection file", flush=True)
+    routes = route_index(ROUTES_PATH.read_text(encoding="utf-8"))["exact"]
+    state = snapshot(watched_files())
+    print(f"Watching routes/api.php and the generator; validating {target_path}", flush=True)
+
+    while True:
+        time.sleep(interval)
+        current = snapshot(watched_files())
+        if current == state:
+            continue
+
+        settled_at = time.perf_counter() + debounce
+        while time.perf_counter() < settled_at:
+            time.sleep(min(interval, debounce))
+            latest = snapshot(watched_files())
+            if latest != current:
+                current = latest
+                settled_at = time.perf_counter() + debounce
+
+        started = time.perf_counter()
+        changed = {path for path in state.keys() | current.keys() if state.get(path) != current.get(path)}
+        state = current
+        if Path(__file__).resolve() in changed:
+            print("Generator script changed, restarting", flush=True)
+            os.execv(sys.executable, [sys.executable, *sys.argv])
+
+        new_routes = route_index(ROUTES_PATH.read_text(encoding="utf-8"))["exact"]
+        added, removed = len(new_routes - routes), len(routes - new_routes)
+        routes = new_routes
+        written = regenerate(target_path, cache, validate)
+        if written is None:
+            print("Validation failed, keeping the previous collection file", flush=True)
+            continue
+        elapsed = (time.perf_counter() - started) * 1000
+        print(
+            f"{', '.join(sorted(path.name for path in changed))}: {added} routes added, {removed} removed; "
+            f"{'wrote' if written else 'unchanged'} {target_path} in {elapsed:.1f} ms",
+            flush=True,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the KFitz Postman collection.")
+    parser.add_argument("command", nargs="?", choices=["generate", "validate"], default="generate")
+    parser.add_argument(
+        "--output",
+        default=str(COLLECTION_PATH),
+        help="Collection file to write, or to check with the validate command.",
+    )
+    parser.add_argument("--no-validate", action="store_true", help="Write the collection even if validation fails.")
+    parser.add_argument("--watch", action="store_true", help="Regenerate and revalidate whenever routes/api.php or the generator changes.")
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between file polls in watch mode.")
+    parser.add_argument("--debounce", type=float, default=0.05, help="Quiet period before rebuilding in watch mode.")
+    args = parser.parse_args(argv)
+
+    if args.command == "validate":
+        with Path(args.output).open(encoding="utf-8") as f:
+            collection = json.load(f)
+        cache = load_validation_cache()
+        valid = timed_validation(collection, cache, show_warnings=True)
+        save_validation_cache(cache)
+        return 0 if valid else 1
+
+    if args.watch:
+        try:
+            watch(args.output, args.interval, args.debounce, validate=not args.no_validate)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    cache = load_validation_cache()
+    written = regenerate(args.output, cache, validate=not args.no_validate)
+    save_validation_cache(cache)
+    if written is None:
+        print("Collection not written; fix the errors above or pass --no-validate", file=sys.stderr)
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())